@@ -1,3 +1,5 @@
+import importlib
+
 import rethinkdb
 rethinkdb.set_loop_type("asyncio")
 
@@ -8,8 +10,48 @@ ALL             = 0
 DECLARED_ONLY   = 1
 UNDECLARED_ONLY = 2
 
-from .errors import *
-from .db import *
-from .values_and_valuetypes import *
-from .field import *
-from .document import *
+from .errors import IllegalAccessError, AlreadyExistsError, NotFoundError, \
+        IllegalSpecError, ValidationError, StopValidation, NotLoadedError
+from .db import db_conn, init_app_db, configure_db_connection, aiter_changes
+
+# The ODM part of the package (documents, fields, value types) is imported on
+# first access (PEP 562), so that code which only needs the DB connection
+# helpers doesn't have to pay for it.
+_lazy_names = {
+        "Field": ".field",
+        "FieldAlias": ".field",
+        "Document": ".document",
+        }
+for _name in [ "AnyValueType", "TypedValueType",
+        "IntValueType", "StringValueType",
+        "TupleValueType", "ListValueType", "SetValueType", "DictValueType",
+        "NamedTupleValueType",
+        "LazyValue", "LazyValueType",
+        "FieldContainer", "FieldContainerValueType" ]:
+    _lazy_names[_name] = ".values_and_valuetypes"
+for _name in [ "LazyDocRefValueType", "LazyDocRef", "lazy_doc_ref", "lval" ]:
+    _lazy_names[_name] = ".values_and_valuetypes.reference"
+del _name
+
+
+def __getattr__(name):
+    try:
+        module_name = _lazy_names[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                .format(__name__, name)) from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # don't come here again for this name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
+
+
+__all__ = [ "ALL", "DECLARED_ONLY", "UNDECLARED_ONLY",
+        "IllegalAccessError", "AlreadyExistsError", "NotFoundError",
+        "IllegalSpecError", "ValidationError", "StopValidation",
+        "NotLoadedError",
+        "db_conn", "init_app_db", "configure_db_connection", "aiter_changes",
+        ] + list(_lazy_names)
@@ -1,13 +1,20 @@
-import threading
 import asyncio
+import contextvars
+import time
 import weakref
-from functools import partial
 import inspect
 import collections
 
 import rethinkdb as r
 r.set_loop_type("asyncio")
 
+# bound once, as they are looked up on hot paths
+_ReqlCursorEmpty = r.ReqlCursorEmpty
+_ReqlTimeoutError = r.ReqlTimeoutError
+_ReqlError = r.ReqlError
+_RqlQuery = r.RqlQuery
+_Changes = r.ast.Changes
+
 from .errors import IllegalAccessError, AlreadyExistsError
 from .registry import registry
 
@@ -18,57 +25,364 @@ __all__ = [ "db_conn", "init_app_db", "configure_db_connection", "aiter_changes"
 # DB connections
 ###############################################################################
 
-class _OneConnPerThreadPool:
-    """Keeps track of one RethinkDB connection per thread.
-    
-    Get (or create) the current thread's connection with get() or just
-    __await__. close() closes and discards the the current thread's connection
-    so that a subsequent __await__ or get opens a new connection.
+class _ConnectionPool:
+    """A bounded pool of RethinkDB connections, for use on one event loop.
+
+    Connections are opened lazily, up to ``size`` of them. acquire() hands out
+    a connection for exclusive use (waiting for one to be released if all of
+    them are in use), and release() gives it back to the pool. Connections
+    that have been closed in the meantime, or that are older than ``ttl``
+    seconds, are replaced with fresh ones on acquire().
+
+    connect() returns an async context manager that does acquire() and
+    release() for you::
+
+        async with pool.connect() as cn:
+            await some_query.run(cn)
+
+    Besides the pooled connections, the pool keeps one "default" connection
+    (see get_default()) which is shared by everyone who doesn't need a
+    connection of their own. The default connection does not count against
+    ``size``. It is replaced when it has been closed, but it is not recycled
+    after ``ttl`` seconds, as long running queries (changefeeds, mostly) might
+    be using it.
     """
 
-    def __init__(self):
-        self._tl = threading.local()
-        self._connect_kwargs = None
+    def __init__(self, connect_kwargs, size = 5, ttl = 3600):
+        self._connect_kwargs = connect_kwargs
+        self._size = size
+        self._ttl = ttl
+        self._queue = asyncio.Queue()
+        self._opened_at = {} # { pooled connection : time it was opened }
+        self._num_conns = 0 # number of pooled connections (opened or opening)
+        self._default = None
+        self._db_ensured = False # True once we know that our DB exists
+        self._db_lock = asyncio.Lock()
+
+
+    async def init_pool(self, min_size = None):
+        """Opens connections until the pool has at least ``min_size`` of them
+        (default: as many as the pool can hold).
+        """
+        if min_size is None:
+            min_size = self._size
+        while self._num_conns < min(min_size, self._size):
+            self.release(await self._open())
+
+
+    async def _open(self):
+        self._num_conns += 1
+        try:
+            conn = await r.connect(**self._connect_kwargs)
+        except BaseException:
+            self._num_conns -= 1
+            raise
+        self._opened_at[conn] = time.monotonic()
+        return conn
+
+
+    async def _discard(self, conn):
+        if self._opened_at.pop(conn, None) is not None:
+            self._num_conns -= 1
+        if conn.is_open():
+            await conn.close(False)
+
+
+    def _is_usable(self, conn):
+        return conn.is_open() and \
+                time.monotonic() - self._opened_at[conn] < self._ttl
+
+
+    async def acquire(self):
+        """Returns a connection from the pool, opening a new one if the pool
+        isn't full yet. Give the connection back with release() when you're
+        done.
+        """
+        if self._queue.empty() and self._num_conns < self._size:
+            return await self._open()
+
+        conn = await self._queue.get()
+        if not self._is_usable(conn):
+            await self._discard(conn)
+            conn = await self._open()
+        return conn
+
+
+    def release(self, conn):
+        """Gives a connection obtained with acquire() back to the pool.
+        Connections that don't belong to the pool (anymore) are ignored.
+        """
+        if conn in self._opened_at:
+            self._queue.put_nowait(conn)
+
+
+    def connect(self):
+        """Returns an async context manager that acquires a connection on
+        entry and releases it on exit.
+        """
+        return _PooledConnection(self)
+
+
+    def _usable_default(self):
+        """Returns the default connection, or None if it hasn't been opened yet
+        or has been closed in the meantime.
+        """
+        conn = self._default
+        if conn is not None and not conn.is_open():
+            conn = self._default = None
+        return conn
+
+
+    async def get_default(self):
+        """Gets or opens the default connection. If the default connection has
+        been closed (for instance because the server went away), a new one is
+        opened.
+        """
+        conn = self._usable_default()
+        if conn is None:
+            conn = self._default = await r.connect(**self._connect_kwargs)
+        return conn
+
+
+    async def ensure_db(self, conn):
+        """Creates our DB on conn if it doesn't exist yet. Once this has
+        succeeded, subsequent calls return right away without querying the DB.
+        """
+        if self._db_ensured:
+            return
+        async with self._db_lock:
+            if self._db_ensured: # someone else did it while we were waiting
+                return
+            our_db = self._connect_kwargs["db"]
+            # check and create in one query
+            await r.branch(r.db_list().contains(our_db),
+                    None,
+                    r.db_create(our_db)).run(conn)
+            self._db_ensured = True
+
+
+    async def close(self, noreply_wait = True):
+        """Closes the default connection and all pooled connections,
+        including those that are currently acquired.
+        """
+        conns = list(self._opened_at.keys())
+        if self._default is not None:
+            conns.append(self._default)
+        self._default = None
+        self._opened_at.clear()
+        self._num_conns = 0
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        for conn in conns:
+            if conn.is_open():
+                await conn.close(noreply_wait)
+
+
+
+class _PooledConnection:
+    """Async context manager returned by ``_ConnectionPool.connect()``.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = None
+
+
+    async def __aenter__(self):
+        self._conn = await self._pool.acquire()
+        return self._conn
 
 
-    def configure_db_connection(self, **connect_kwargs):
-        if self._connect_kwargs != None:
+    async def __aexit__(self, exc_type, exc, tb):
+        self._pool.release(self._conn)
+        self._conn = None
+
+
+
+class _ConnectionManager:
+    """Keeps track of RethinkDB connections, using one ``_ConnectionPool`` per
+    event loop (and thus, typically, per thread).
+
+    Get (or open) the current connection with get() or just __await__. That is
+    the event loop's default connection, unless you are in a session (see
+    below). For a connection of your own, which is taken from (and given back
+    to) the event loop's pool, use ``async with db_conn.connect() as cn``. Use
+    this when you run many queries concurrently, so that they don't all have
+    to go through the same connection. close() closes and discards all of the
+    event loop's connections so that a subsequent __await__ or get opens a new
+    connection.
+
+    A session is like connect(), except that the session's connection also
+    becomes the current connection for everything that runs inside ``async
+    with db_conn.session()``, including tasks started from there. This way,
+    code that just uses ``await db_conn`` (for instance all of Document's
+    methods when you don't pass them a connection) gets to use a connection
+    of its own per task::
+
+        async def handle_request(...):
+            async with db_conn.session():
+                doc = await MyDocument.load(...) # uses the session's connection
+    """
+
+    def __init__(self):
+        self._connect_kwargs = None
+        self._pool_size = None
+        self._connection_ttl = None
+        # { event loop : weakref to its pool }. The pool's connections refer
+        # to the loop, so the loop itself has to keep the pool alive (see
+        # _get_pool): then both go away together.
+        self._pools = weakref.WeakKeyDictionary()
+        self._pinned_pools = {} # { event loop : pool } for loops that
+                                # don't take attributes
+        self._session_conn = contextvars.ContextVar("aiorethink_session_conn",
+                default = None)
+
+
+    def configure_db_connection(self, pool_size, connection_ttl,
+            **connect_kwargs):
+        if self._connect_kwargs is not None:
             raise AlreadyExistsError("Can not re-configure DB connection(s)")
         self._connect_kwargs = connect_kwargs
+        self._pool_size = pool_size
+        self._connection_ttl = connection_ttl
+
+
+    def _get_pool(self):
+        """Gets or makes the current event loop's connection pool.
+        """
+        loop = asyncio.get_event_loop()
+        pool_ref = self._pools.get(loop)
+        if pool_ref is not None:
+            return pool_ref()
+
+        if self._connect_kwargs is None:
+            raise IllegalAccessError("DB connection parameters not set yet")
+        pool = _ConnectionPool(self._connect_kwargs,
+                self._pool_size, self._connection_ttl)
+        try:
+            pools = loop.__dict__.setdefault("_aiorethink_pools", {})
+        except AttributeError:
+            # such a loop's pool lives until close() is called
+            self._pinned_pools[loop] = pool
+        else:
+            pools[id(self)] = pool
+        self._pools[loop] = weakref.ref(pool)
+        return pool
+
+
+    def _drop_pool(self, loop):
+        """Forgets loop's pool, and returns it (or None if there's none).
+        """
+        pool_ref = self._pools.pop(loop, None)
+        if pool_ref is None:
+            return None
+        self._pinned_pools.pop(loop, None)
+        getattr(loop, "_aiorethink_pools", {}).pop(id(self), None)
+        return pool_ref()
 
 
     def __await__(self):
-        return self.get().__await__()
+        # same as get(), but without making a coroutine when we already have
+        # a connection
+        conn = self.get_nowait()
+        if conn is None:
+            conn = yield from self._get_pool().get_default().__await__()
+        return conn
+
+
+    def get_nowait(self):
+        """Returns the current connection (see get()) if we have one already,
+        or None if it would have to be opened first. See _resolve_conn().
+        """
+        conn = self._session_conn.get()
+        if conn is None:
+            conn = self._get_pool()._usable_default()
+        return conn
 
 
     async def get(self):
-        """Gets or opens the thread's DB connection.
+        """Gets the current session's DB connection, or gets or opens the event
+        loop's default DB connection if we're not in a session.
         """
-        if self._connect_kwargs == None:
-            raise IllegalAccessError("DB connection parameters not set yet")
+        conn = self._session_conn.get()
+        if conn is not None:
+            return conn
+        return await self._get_pool().get_default()
 
-        if not hasattr(self._tl, "conn"):
-            self._tl.conn = await r.connect(**self._connect_kwargs)
 
-        return self._tl.conn
+    def connect(self):
+        """Returns an async context manager that acquires a connection from the
+        event loop's connection pool, and gives it back on exit::
+
+            async with db_conn.connect() as cn:
+                await some_query.run(cn)
+        """
+        return self._get_pool().connect()
+
+
+    def session(self):
+        """Returns an async context manager that acquires a connection from the
+        event loop's connection pool and makes it the current connection (the
+        one you get with ``await db_conn``) until exit, when it gives it back
+        to the pool.
+        """
+        return _Session(self)
 
 
     async def close(self, noreply_wait = True):
-        """Closes the thread's DB connection.
+        """Closes all of the event loop's DB connections.
         """
-        if hasattr(self._tl, "conn"):
-            if self._tl.conn.is_open():
-                await self._tl.conn.close(noreply_wait)
-            del self._tl.conn
+        pool = self._drop_pool(asyncio.get_event_loop())
+        if pool is not None:
+            await pool.close(noreply_wait)
+
+db_conn = _ConnectionManager()
+
 
-db_conn = _OneConnPerThreadPool()
+async def _resolve_conn(conn = None):
+    """Returns `conn` if given, or else the current connection, opening it
+    only if we don't have one yet.
+    """
+    return conn or db_conn.get_nowait() or await db_conn
+
+
+
+class _Session:
+    """Async context manager returned by ``_ConnectionManager.session()``.
+    """
+
+    def __init__(self, manager):
+        self._manager = manager
+        self._pooled = None
+        self._token = None
+
+
+    async def __aenter__(self):
+        self._pooled = self._manager.connect()
+        conn = await self._pooled.__aenter__()
+        self._token = self._manager._session_conn.set(conn)
+        return conn
+
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._manager._session_conn.reset(self._token)
+        self._token = None
+        await self._pooled.__aexit__(exc_type, exc, tb)
+        self._pooled = None
 
 
-def configure_db_connection(db, **kwargs_for_rethink_connect):
+def configure_db_connection(db, pool_size = 5, connection_ttl = 3600,
+        **kwargs_for_rethink_connect):
     """Sets DB connection parameters. This function should be called exactly
     once, before init_app_db is called or db_conn is first used.
+
+    `pool_size` is the maximum number of connections per event loop that
+    ``db_conn.connect()`` hands out concurrently. Pooled connections are
+    replaced with new ones once they are `connection_ttl` seconds old.
     """
-    db_conn.configure_db_connection(db = db, **kwargs_for_rethink_connect)
+    db_conn.configure_db_connection(pool_size, connection_ttl,
+            db = db, **kwargs_for_rethink_connect)
 
 
 
@@ -77,20 +391,39 @@ def configure_db_connection(db, **kwargs_for_rethink_connect):
 ###############################################################################
 
 async def init_app_db(reconfigure_db = False, conn = None):
-    cn = conn or await db_conn
+    cn = await _resolve_conn(conn)
+
+    # create DB if it doesn't exist (we only check once per event loop, or
+    # until db_conn.close())
+    await db_conn._get_pool().ensure_db(cn)
+
+    doc_classes = list(registry.values())
+    if not doc_classes:
+        return
+
+    # find out which tables exist with one query, instead of one query per
+    # Document class
+    existing_tables = set(await r.table_list().run(cn))
+
+    # (re)configure DB tables. Tables are independent of each other, so we
+    # set them up concurrently, each on its own connection from the pool
+    # (unless the caller gave us a connection to use).
+    async def setup_table(doc_class):
+        if doc_class._tablename in existing_tables:
+            if not reconfigure_db:
+                return
+            setup = doc_class._reconfigure_table
+        else:
+            setup = doc_class._create_table
 
-    # create DB if it doesn't exist
-    our_db = db_conn._connect_kwargs["db"]
-    dbs = await r.db_list().run(cn)
-    if our_db not in dbs:
-        await r.db_create(our_db).run(cn)
+        if conn is not None:
+            await setup(conn)
+        else:
+            async with db_conn.connect() as cn:
+                await setup(cn)
 
-    # (re)configure DB tables
-    for doc_class in registry.values():
-        if not await doc_class.table_exists(cn):
-            await doc_class._create_table(cn)
-        elif reconfigure_db:
-            await doc_class._reconfigure_table(cn)
+    await asyncio.gather(*[ setup_table(doc_class)
+        for doc_class in doc_classes ])
 
 
 
@@ -98,7 +431,7 @@ async def init_app_db(reconfigure_db = False, conn = None):
 # DB query helpers
 ###############################################################################
 
-async def _run_query(query, conn = None):
+async def _run_query(query, conn = None, **run_kwargs):
     """`run()`s query if caller hasn't already done so, then awaits and returns
     its result.
 
@@ -108,34 +441,83 @@ async def _run_query(query, conn = None):
 
     If run() has not been called, then the query is run on the given connection
     (or the default connection). This is more convenient for the caller than
-    the other version.
+    the other version. `run_kwargs` are passed on to run(). Useful ones are the
+    cursor batching options, for instance ``max_batch_rows = 1000`` to keep
+    memory usage low when streaming through a large cursor, or
+    ``max_batch_bytes = 16 * 2**20`` for fewer round trips in bulk reads.
+    `run_kwargs` are ignored when run() has already been called.
     """
-    # run() it if caller didn't do that already
-    if not inspect.isawaitable(query):
-        if not isinstance(query, r.RqlQuery):
-            raise TypeError("query is neither awaitable nor a RqlQuery")
-        cn = conn or await db_conn
-        query = query.run(cn)
+    # run() it if caller didn't do that already. Unrun queries are the common
+    # case, so check for those first: isinstance is much cheaper than
+    # inspect.isawaitable.
+    if isinstance(query, _RqlQuery):
+        cn = await _resolve_conn(conn)
+        return await query.run(cn, **run_kwargs)
 
+    if not inspect.isawaitable(query):
+        raise TypeError("query is neither awaitable nor a RqlQuery")
     return await query
 
 
 
-async def aiter_changes(query, value_type, conn = None):
+async def aiter_changes(query, value_type, conn = None,
+        include_message = True, **run_kwargs):
     """Runs any changes() query, and from its result stream constructs "Python
     world" objects as determined by value_type (which may equal None when
     data is deleted from the DB).
 
     The function returns an asynchronous iterator (a ``ChangesAsyncMap``),
     which yields `(constructed python object, changefeed message)` tuples.
-    Note that `constructed python object` might well be None.
+    Note that `constructed python object` might well be None. If you pass
+    ``include_message = False``, the iterator (a
+    ``ChangesAsyncMapValuesOnly``) yields just the constructed objects.
 
     The `query` might or might not already have called `run()`, but it should
-    not have been awaited on yet (check ``_run_query`` for details).
+    not have been awaited on yet (check ``_run_query`` for details, and for
+    `run_kwargs`). If run() has not been called yet and the query asks for
+    status messages (``include_states = True``), they are filtered out by the
+    server.
     """
-    feed = await _run_query(query, conn)
+    # look up the (bound) method once, not per message
     mapper = value_type.dbval_to_pyval
-    return ChangesAsyncMap(feed, mapper)
+    query, new_vals_only = _without_status_messages(query)
+    feed = await _run_query(query, conn, **run_kwargs)
+    if include_message:
+        return ChangesAsyncMap(feed, mapper, new_vals_only = new_vals_only)
+    return ChangesAsyncMapValuesOnly(feed, mapper,
+            new_vals_only = new_vals_only)
+
+
+def _without_status_messages(changes_query):
+    """If a changes() query asks for status messages such as ``{"state":
+    "ready"}`` (``include_states = True``), makes the server drop changefeed
+    messages that don't carry a `new_val`, so that they don't have to go over
+    the wire. Returns the query, and True if the filter was added (then every
+    message has a `new_val`). Queries that have already been run(), and
+    queries that don't ask for status messages, are returned unchanged.
+    """
+    if not isinstance(changes_query, _RqlQuery) or \
+            not _asks_for_states(changes_query):
+        return changes_query, False
+    # NB has_fields("new_val") would also drop deletions, where new_val is null
+    return changes_query.filter(
+            lambda message: message.keys().contains("new_val")), True
+
+
+def _asks_for_states(query):
+    """Returns True if a changes() term in the query has ``include_states``
+    set (to True, or to something that is only evaluated on the server).
+    """
+    terms = [query]
+    while terms:
+        term = terms.pop()
+        if isinstance(term, _Changes):
+            include_states = term.optargs.get("include_states", None)
+            if include_states is not None and \
+                    getattr(include_states, "data", True):
+                return True
+        terms.extend(term._args)
+    return False
 
 
 
@@ -143,34 +525,151 @@ async def aiter_changes(query, value_type, conn = None):
 # Asynchronous iterators over cursors and changefeeds
 ###############################################################################
 
+def _prefetch(cursor):
+    """Starts fetching the next item from cursor in the background, and returns
+    the future for it.
+    """
+    fut = asyncio.ensure_future(cursor.next())
+    # iterators can be abandoned with a prefetch still going on. Retrieve the
+    # exception (if any) so that asyncio doesn't complain about it. Whoever
+    # awaits fut still gets the exception.
+    fut.add_done_callback(_retrieve_exception)
+    return fut
+
+
+def _retrieve_exception(fut):
+    if not fut.cancelled():
+        fut.exception()
+
+
+
 class CursorAsyncIterator(collections.abc.AsyncIterator):
     """Async iterator that iterates over a RethinkDB cursor until it's empty.
+
+    When the cursor has handed out all the items it has received so far (and
+    more are to come), the next item is fetched in the background while the
+    current one is being processed, so that the consumer doesn't have to sit
+    idle while the cursor waits for the server. If you stop iterating before
+    the cursor is empty, call ``close()`` (or ``aclose()``). An iterator that
+    is dropped without that stops fetching when it is garbage collected.
     """
+    __slots__ = ("cursor", "_pending")
+
     def __init__(self, cursor):
         self.cursor = cursor
+        self._pending = None # future for the next item, if being fetched
 
 
-    async def __aiter__(self):
+    def __aiter__(self):
         return self
 
 
     async def __anext__(self):
+        cursor = self.cursor
+        pending = self._pending
         try:
-            return await self.cursor.next()
-        except r.ReqlCursorEmpty:
+            if pending is None:
+                item = await cursor.next()
+            else:
+                self._pending = None
+                item = await pending
+        except _ReqlCursorEmpty:
             raise StopAsyncIteration
+        # items that the cursor has in its buffer are there right away. Only
+        # when the buffer has run empty (and the cursor isn't done) is it worth
+        # starting to wait for the next item before we're asked for it
+        if not cursor.items and cursor.error is None:
+            self._pending = _prefetch(cursor)
+        return item
+
+
+    def _cancel_pending(self):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            pending.cancel()
+
+
+    def __del__(self):
+        # don't leave a prefetch running for an iterator nobody uses anymore
+        try:
+            self._cancel_pending()
+        except RuntimeError:
+            pass # event loop has been closed already
+
+
+    async def close(self):
+        """Stops fetching items and closes the cursor.
+        """
+        self._cancel_pending()
+        await self.cursor.close()
+
+
+    async def aclose(self):
+        """Same as ``close()``.
+        """
+        await self.close()
 
 
-    async def as_list(self):
+    async def as_list(self, size_hint = None):
         """Turns the asynchronous iterator into a list by doing the iteration
         and collecting the resulting items into a list.
+
+        Items are collected batch by batch (see ``batches()``). If you know
+        roughly how many items to expect (for instance from a count() query),
+        pass that as `size_hint` so that the list is allocated in one go.
         """
-        l = []
-        async for item in self:
-            l.append(item)
+        l = [None] * size_hint if size_hint else []
+        i = 0
+        async for batch in self.batches():
+            n = i + len(batch)
+            l[i:n] = batch
+            i = n
+        del l[i:]
         return l
 
 
+    async def batches(self):
+        """Async generator that yields the iterator's items in lists: each
+        list holds the items that the cursor has received from the server so
+        far (usually, one batch). Use it instead of iterating item by item if
+        you process large result sets, as it awaits once per batch rather than
+        once per item. (RethinkDB's ``max_batch_rows`` run option controls how
+        big batches get.)
+        """
+        cursor = self.cursor
+        next_item = CursorAsyncIterator.__anext__
+        map_items = self._map_items
+        while True:
+            try:
+                batch = [await next_item(self)]
+            except StopAsyncIteration:
+                return
+
+            if self._pending is None:
+                # take the items the cursor has received already, without
+                # waiting for more
+                try:
+                    while True:
+                        batch.append(await cursor.next(wait = False))
+                except _ReqlTimeoutError:
+                    # used them all up; wait for more while the consumer works
+                    self._pending = _prefetch(cursor)
+                except (_ReqlCursorEmpty, _ReqlError):
+                    # cursor is done. If it failed, the next round raises the
+                    # error, after the consumer got the items before it.
+                    pass
+
+            yield map_items(batch)
+
+
+    def _map_items(self, items):
+        """Turns a list of items from the cursor into a list of what this
+        iterator yields. Used by ``batches()``.
+        """
+        return items
+
+
 
 class CursorAsyncMap(CursorAsyncIterator):
     """Async iterator that iterates through a RethinkDB cursor, mapping each
@@ -181,6 +680,8 @@ class CursorAsyncMap(CursorAsyncIterator):
 
     The ``as_list()`` coroutine creates a list out of the iterated items.
     """
+    __slots__ = ("mapper",)
+
     def __init__(self, cursor, mapper):
         """cursor is a RethinkDB cursor. mapper is a function accepting one
         parameter: whatever comes out of cursor.next().
@@ -190,9 +691,61 @@ class CursorAsyncMap(CursorAsyncIterator):
 
 
     async def __anext__(self):
-        item = await super().__anext__()
-        mapped = self.mapper(item)
-        return mapped
+        return self.mapper(await super().__anext__())
+
+
+    def _map_items(self, items):
+        return list(map(self.mapper, items))
+
+
+
+class _ChangefeedBuffer:
+    """State shared between a ChangesAsyncMap and the task that reads its
+    changefeed. The task only ever sees this, not the iterator, so that an
+    iterator nobody references anymore can be garbage collected (and stop the
+    task).
+    """
+    __slots__ = ("buf", "max_prefetch", "ready", "room", "exhausted", "error")
+
+    def __init__(self, max_prefetch):
+        self.buf = collections.deque() # messages read but not yet consumed
+        self.max_prefetch = max_prefetch
+        self.ready = asyncio.Event() # buffer is not empty, or reading has ended
+        self.room = asyncio.Event() # buffer is not full
+        self.room.set()
+        self.exhausted = False
+        self.error = None # exception reading ended with, if any
+
+
+async def _pump_changefeed(cursor, state):
+    """Reads messages from the changefeed into the buffer until the changefeed
+    ends or fails, or until the task running this is cancelled.
+    """
+    buf = state.buf
+    max_prefetch = state.max_prefetch
+    try:
+        while True:
+            if len(buf) >= max_prefetch:
+                state.room.clear()
+                await state.room.wait()
+                continue
+
+            buf.append(await cursor.next())
+            # messages that have arrived already are there without waiting
+            try:
+                while len(buf) < max_prefetch:
+                    buf.append(await cursor.next(wait = False))
+            except _ReqlTimeoutError:
+                pass
+            state.ready.set()
+    except asyncio.CancelledError:
+        await cursor.close()
+        raise
+    except _ReqlCursorEmpty:
+        state.exhausted = True
+    except Exception as e:
+        state.error = e
+    state.ready.set()
 
 
 
@@ -204,34 +757,130 @@ class ChangesAsyncMap(CursorAsyncIterator):
     None, for instance when documents are deleted from the DB.
     
     Changefeed messages that do not contain a `new_val` (status messages) are
-    ignored.
+    ignored. If you know that every message has one (for instance because the
+    server filters the others out, see ``_without_status_messages``), pass
+    ``new_vals_only = True`` to skip that check.
+
+    Once iteration has started, a background task keeps reading messages from
+    the changefeed into a buffer, from which __anext__ is served. On a busy
+    changefeed, this way the consumer mostly gets its next message without
+    having to wait for (and switch to) the task reading from the socket. The
+    buffer holds at most `max_prefetch` messages; when it is full, reading
+    pauses until the consumer catches up. If you stop iterating before the
+    changefeed ends, call ``close()`` (or ``aclose()``). An iterator that is
+    dropped without that stops reading when it is garbage collected.
 
     Example: ``Document.aiter_changes()`` returns a ChangesAsyncMap that maps
     each new_val (i.e., changed and inserted documents) to Document.from_doc().
     """
-    def __init__(self, changefeed, mapper):
+    __slots__ = ("mapper", "max_prefetch", "new_vals_only", "_state",
+            "_pump_task")
+
+    def __init__(self, changefeed, mapper, max_prefetch = 1000,
+            new_vals_only = False):
         """`changefeed` is a RethinkDB changes stream (technically, a RethinkDB
         cursor). `mapper` is a function accepting one parameter: a `new_val`
         from a changefeed message.
         """
         super().__init__(changefeed)
         self.mapper = mapper
+        self.max_prefetch = max_prefetch
+        self.new_vals_only = new_vals_only
+        self._state = None # _ChangefeedBuffer, created on first __anext__
+        self._pump_task = None
 
 
     async def __anext__(self):
         # process and yield next message from changefeed that carries a
         # "new_val"
+        state = self._state or self._start_pump()
+        buf = state.buf
+        mapper = self.mapper
+        check_new_val = not self.new_vals_only
         while True:
-            message = await super().__anext__()
+            if not buf:
+                await self._wait_for_messages(state)
+
+            message = buf.popleft()
+            state.room.set()
 
-            if "new_val" not in message:
+            if check_new_val and "new_val" not in message:
                 continue
 
-            mapped = self.mapper(message["new_val"])
-            return mapped, message
+            return mapper(message["new_val"]), message
 
 
-    async def as_list(self):
+    @staticmethod
+    async def _wait_for_messages(state):
+        """Waits until there's something in the buffer. Raises
+        StopAsyncIteration when the changefeed has ended. If it failed, the
+        exception it failed with is raised (once; after that, the iterator is
+        exhausted).
+        """
+        while not state.buf:
+            error = state.error
+            if error is not None:
+                state.error = None
+                state.exhausted = True
+                raise error
+            if state.exhausted:
+                raise StopAsyncIteration
+            state.ready.clear()
+            await state.ready.wait()
+
+
+    def _start_pump(self):
+        state = self._state = _ChangefeedBuffer(self.max_prefetch)
+        self._pump_task = asyncio.ensure_future(
+                _pump_changefeed(self.cursor, state))
+        return state
+
+
+    def _cancel_pending(self):
+        super()._cancel_pending()
+        task = self._pump_task
+        if task is not None:
+            self._pump_task = None
+            task.cancel()
+
+
+    async def close(self):
+        """Stops reading from the changefeed and closes it. Messages that have
+        already been read are dropped.
+        """
+        state = self._state
+        if state is None:
+            state = self._state = _ChangefeedBuffer(self.max_prefetch)
+        state.exhausted = True
+        state.error = None
+        state.buf.clear()
+        state.ready.set()
+        await super().close()
+
+
+    def as_list(self, size_hint = None):
         """This is verboten on changefeeds as they have infinite length.
+
+        Not a coroutine function, so that the error is raised right when
+        as_list() is called rather than when its result is awaited.
         """
         raise NotImplementedError("as_list makes no sense on changefeeds")
+
+
+    def batches(self):
+        """Not supported on changefeeds. Iterate over the changefeed instead,
+        which serves messages from a prefetch buffer anyway.
+        """
+        raise NotImplementedError("batches is not supported on changefeeds")
+
+
+
+class ChangesAsyncMapValuesOnly(ChangesAsyncMap):
+    """Like ``ChangesAsyncMap``, but yields only the mapped objects, not
+    (mapped object, changefeed message) tuples. Use this if you don't need the
+    messages.
+    """
+    __slots__ = ()
+
+    async def __anext__(self):
+        return (await super().__anext__())[0]
@@ -1,6 +1,4 @@
 import collections
-import functools
-import inspect
 
 import inflection
 import rethinkdb as r
@@ -8,10 +6,12 @@ import rethinkdb as r
 from . import ALL, DECLARED_ONLY, UNDECLARED_ONLY
 from .errors import IllegalSpecError, AlreadyExistsError, NotFoundError
 from .registry import registry
-from .db import db_conn, CursorAsyncIterator, CursorAsyncMap, ChangesAsyncMap,\
-            _run_query
+from .db import CursorAsyncIterator, CursorAsyncMap, ChangesAsyncMap,\
+            ChangesAsyncMapValuesOnly, _run_query, _without_status_messages, \
+            _resolve_conn, _ReqlCursorEmpty
 from .field import Field, FieldAlias
 from .values_and_valuetypes.field_container import FieldContainer, _MetaFieldContainer
+from .values_and_valuetypes.base_types import AnyValueType
 
 __all__ = [ "Document" ]
 
@@ -19,8 +19,6 @@ __all__ = [ "Document" ]
 class _MetaDocument(_MetaFieldContainer):
 
     def __init__(cls, name, bases, classdict):
-        cls._tablename = cls._get_tablename()
-
         # make sure that the following runs only for subclasses of Document.
         # There's no really nice way to do this AFAIK, because 'Document' is
         # not known yet when this is called. The best I could come up with is
@@ -31,14 +29,227 @@ class _MetaDocument(_MetaFieldContainer):
         super().__init__(name, bases, classdict)
 
 
+    # The table name (and the query term for the table) are only figured out
+    # when they are first needed, so that defining lots of Document classes
+    # (of which maybe only a few are ever used) stays cheap.
+
+    @property
+    def _tablename(cls):
+        tablename = cls.__dict__.get("_resolved_tablename")
+        if tablename is None:
+            tablename = cls._get_tablename()
+            cls._resolved_tablename = tablename
+        return tablename
+
+
+    @property
+    def _cq_term(cls):
+        cq_term = cls.__dict__.get("_resolved_cq_term")
+        if cq_term is None:
+            # ReQL terms are never modified by chaining, so cq() can hand out
+            # the same one every time
+            cq_term = r.table(cls._tablename)
+            cls._resolved_cq_term = cq_term
+        return cq_term
+
+
+
+# marks changefeed messages without a new_val (see ChangesAsyncIterator)
+_NO_NEW_VAL = object()
+
+# marks fields that are not in a doc (see _compile_from_doc)
+_NOT_IN_DOC = object()
+
+
+def _field_is_plain(fld):
+    """Returns True if the field's DB value is just its value, without any
+    conversion or validation going on.
+    """
+    val_type = fld.val_type
+    return type(fld) is Field and type(val_type) is AnyValueType and \
+            not fld.required and val_type._extra_validators is None and \
+            not val_type._forbid_none
+
+
+def _field_dbval_is_val(fld):
+    """Returns True if the field's DB value is just its value, i.e. if its
+    value type doesn't convert (validation aside).
+    """
+    return type(fld) is Field and fld._to_dbval is None
+
+
+def _make_plain_pkey_q(cls, pk_name, pk_default):
+    """Makes a Document.q() for Document classes where ``_pkey_is_plain()``.
+    """
+    cq_term = None # cls._cq_term, looked up on first use
+
+    def q(self):
+        nonlocal cq_term
+        if cq_term is None:
+            cq_term = cls._cq_term
+        return cq_term.get(self._declared_fields_values.get(pk_name,
+            pk_default))
+    q.__doc__ = Document.q.__doc__
+    q._plain_pkey_q = True
+    return q
+
+
+def _compile_insert_plan(insert_plan, plain_defaults):
+    """Makes a function that does what Document._make_insert_dict does, but
+    with the loop over insert_plan unrolled, i.e. without iterating over the
+    plan and unpacking its entries on every call. The dict is made with one
+    dict display (plus one conditional item for the primary key).
+
+    plain_defaults maps the names of fields whose DB value is just their
+    value (see _field_dbval_is_val) to their defaults. Their values are taken
+    from the document's values dict directly instead of through the field's
+    conversion method. The source code we compile looks like this::
+
+        def _make_insert_dict(self):
+            values = self._declared_fields_values
+            insert_dict = {
+                'some_field': _convert_1(self),
+                'plain_field': values.get('plain_field', _default_2),
+                }
+            if self.id is not None:
+                insert_dict['id'] = values.get('id', _default_0)
+            insert_dict.update(self._undeclared_fields)
+            return insert_dict
+    """
+    lines = [ "def _make_insert_dict(self):",
+            "    values = self._declared_fields_values",
+            "    insert_dict = {" ]
+    pkey_lines = []
+    namespace = {}
+    for i, (fld_name, db_key, primary_key, convert) in enumerate(insert_plan):
+        if fld_name in plain_defaults:
+            default_name = "_default_{}".format(i)
+            namespace[default_name] = plain_defaults[fld_name]
+            value_expr = "values.get({!r}, {})".format(fld_name, default_name)
+        else:
+            convert_name = "_convert_{}".format(i)
+            namespace[convert_name] = convert
+            value_expr = "{}(self)".format(convert_name)
+        if primary_key:
+            # don't store if not set (then DB should autogenerate). NB field
+            # names are attribute names, and plain attribute access is
+            # quicker than self.get(), which goes through __getitem__
+            pkey_lines.append("    if self.{} is not None:"
+                    .format(fld_name))
+            pkey_lines.append("        insert_dict[{!r}] = {}"
+                    .format(db_key, value_expr))
+        else:
+            lines.append("        {!r}: {},".format(db_key, value_expr))
+    lines.append("        }")
+    lines.extend(pkey_lines)
+    lines.append("    insert_dict.update(self._undeclared_fields)")
+    lines.append("    return insert_dict")
+
+    exec(compile("\n".join(lines), "<aiorethink insert plan>", "exec"),
+            namespace)
+    func = namespace["_make_insert_dict"]
+    func._compiled_insert_plan = True
+    return func
+
+
+def _compile_from_doc(cls):
+    """Makes a function that does what FieldContainer.from_doc does for
+    Document class `cls`, but with the loop over the doc's items replaced by
+    one lookup per declared field. Values of plain fields (see
+    _field_is_plain) are stored directly, without a detour through the
+    field's conversion and validation. Undeclared fields are only looked for
+    if the doc has more items than declared fields found. Unless `cls`
+    customizes __init__, the object is made without calling __init__ (which
+    would only process the empty kwargs and pass them through super()
+    calls). The source code we compile looks like this::
+
+        def _from_doc_impl(doc):
+            obj = _new(cls)
+            obj._declared_fields_values = values = {}
+            obj._updated_fields = set()
+            obj._undeclared_fields = {}
+            obj._stored_in_db = False
+            num_declared = 0
+            dbval = doc.get('id', _NOT_IN_DOC)
+            if dbval is not _NOT_IN_DOC:
+                values['id'] = dbval
+                num_declared += 1
+            dbval = doc.get('some_field', _NOT_IN_DOC)
+            if dbval is not _NOT_IN_DOC:
+                _store_1(obj, dbval)
+                num_declared += 1
+            if num_declared != len(doc):
+                undeclared = obj._undeclared_fields
+                for dbkey, dbval in doc.items():
+                    if dbkey not in _declared_dbnames:
+                        undeclared[dbkey] = dbval
+            return obj
+    """
+    lines = [ "def _from_doc_impl(doc):" ]
+    if cls.__init__ is Document.__init__:
+        # NB this must set up what FieldContainer.__init__ and
+        # Document.__init__ set up
+        lines.extend([ "    obj = _new(cls)",
+            "    obj._declared_fields_values = values = {}",
+            "    obj._updated_fields = set()",
+            "    obj._undeclared_fields = {}",
+            "    obj._stored_in_db = False" ])
+    else:
+        lines.extend([ "    obj = cls()",
+            "    values = obj._declared_fields_values" ])
+    lines.append("    num_declared = 0")
+    namespace = { "cls": cls, "_new": cls.__new__,
+            "_NOT_IN_DOC": _NOT_IN_DOC }
+    declared_dbnames = set()
+    for i, (fld_name, fld_obj) in \
+            enumerate(cls._declared_fields_objects.items()):
+        declared_dbnames.add(fld_obj.dbname)
+        lines.append("    dbval = doc.get({!r}, _NOT_IN_DOC)"
+                .format(fld_obj.dbname))
+        lines.append("    if dbval is not _NOT_IN_DOC:")
+        if _field_is_plain(fld_obj):
+            lines.append("        values[{!r}] = dbval".format(fld_name))
+        else:
+            store_name = "_store_{}".format(i)
+            namespace[store_name] = fld_obj._store_from_doc
+            # NB _store_from_doc doesn't mark fields updated by default
+            lines.append("        {}(obj, dbval)".format(store_name))
+        lines.append("        num_declared += 1")
+    lines.extend([ "    if num_declared != len(doc):",
+            "        undeclared = obj._undeclared_fields",
+            "        for dbkey, dbval in doc.items():",
+            "            if dbkey not in _declared_dbnames:",
+            "                undeclared[dbkey] = dbval",
+            "    return obj" ])
+    namespace["_declared_dbnames"] = frozenset(declared_dbnames)
+
+    exec(compile("\n".join(lines), "<aiorethink from_doc>", "exec"),
+            namespace)
+    return namespace["_from_doc_impl"]
+
+
 
 class Document(FieldContainer, metaclass = _MetaDocument):
     """
     Non-obvious customization:
     cls._table_create_options dict with extra kwargs for rethinkdb.table_create
+
+    See FieldContainer about __slots__.
     """
-    _tablename = None # customize with _get_tablename - don't set this attr
+    __slots__ = ("_stored_in_db",)
+
+    # cls._tablename: customize with _get_tablename - don't set this attr.
+    # cls._cq_term: r.table(_tablename), see cq(). Both are computed on first
+    # access (see _MetaDocument). The properties there are only seen when
+    # accessing them on the class, so instances get these:
+    _tablename = property(lambda self: type(self)._tablename)
+    _cq_term = property(lambda self: type(self)._cq_term)
+    _pkey_name = None # name of the primary key field (cls.pkey.name)
+    _pkey_dbname = None # its name in the DB (cls.pkey.dbname)
     _table_create_options = None # dict with extra kwargs for rethinkdb.table_create
+    _insert_plan = () # ( (field name, db name, is primary key, field to db
+                      # value conversion func), ...). Computed once per class.
+    _from_doc_impl = None # from_doc for this class, see _compile_from_doc
 
 
     def __init__(self, **kwargs):
@@ -104,6 +315,47 @@ class Document(FieldContainer, metaclass = _MetaDocument):
             raise IllegalSpecError("'pkey' attribute is reserved for a "
                     "FieldAlias to the primary key field.")
         cls.pkey = FieldAlias(getattr(cls, pk_name))
+        # ... and plain strings for its names, for quick access
+        cls._pkey_name = pk_name
+        cls._pkey_dbname = cls._declared_fields_objects[pk_name].dbname
+
+        # in the common case of an unconverted, unvalidated primary key, q()
+        # can skip the generic conversion
+        if getattr(cls.q, "_plain_pkey_q", False) or cls.q is Document.q:
+            if cls.cq.__func__ is Document.cq.__func__ and \
+                    cls._pkey_is_plain():
+                cls.q = _make_plain_pkey_q(cls, pk_name,
+                        cls.pkey.default)
+            else:
+                cls.q = Document.q
+
+        # what to do for each declared field when a document is inserted
+        # (see _insert_into_db)
+        cls._insert_plan = tuple(
+                (fld_name, fld_obj.dbname, fld_obj.primary_key,
+                    fld_obj._do_convert_to_doc)
+                for fld_name, fld_obj in cls._declared_fields_objects.items())
+        # ... and a _make_insert_dict made just for this class from that,
+        # unless the class (or a parent) brings its own
+        if getattr(cls._make_insert_dict, "_compiled_insert_plan", False) or \
+                cls._make_insert_dict is Document._make_insert_dict:
+            plain_defaults = { fld_name: fld_obj.default
+                    for fld_name, fld_obj
+                    in cls._declared_fields_objects.items()
+                    if _field_dbval_is_val(fld_obj) }
+            cls._make_insert_dict = _compile_insert_plan(cls._insert_plan,
+                    plain_defaults)
+
+        # a from_doc made just for this class
+        cls._from_doc_impl = staticmethod(_compile_from_doc(cls))
+
+
+    @classmethod
+    def _pkey_is_plain(cls):
+        """Returns True if the primary key field's DB value is just its value,
+        without any conversion or validation going on.
+        """
+        return _field_is_plain(cls.pkey._target_field)
 
 
     ###########################################################################
@@ -111,7 +363,7 @@ class Document(FieldContainer, metaclass = _MetaDocument):
     ###########################################################################
 
     def __repr__(self):
-        s = "{o.__class__.__name__}({o.__class__.pkey.name}={o.pkey})"
+        s = "{o.__class__.__name__}({o.__class__._pkey_name}={o.pkey})"
         return s.format(o = self)
 
 
@@ -126,32 +378,45 @@ class Document(FieldContainer, metaclass = _MetaDocument):
 
     @classmethod
     async def table_exists(cls, conn = None):
-        cn = conn or await db_conn
+        cn = await _resolve_conn(conn)
         db_tables = await r.table_list().run(cn)
         return cls._tablename in db_tables
 
     @classmethod
     async def _create_table(cls, conn = None):
-        cn = conn or await db_conn
-        # make sure table doesn't exist yet
-        if await cls.table_exists(cn):
-            raise AlreadyExistsError("table {} already exists"
-                    .format(cls._tablename))
+        cn = await _resolve_conn(conn)
 
         # assemble kwargs for call to table_create
         create_args = {}
         if cls._table_create_options != None:
             create_args.update(cls._table_create_options)
         ## declare primary key field if it is not "id"
-        if cls.pkey.dbname != "id":
-            create_args["primary_key"] = cls.pkey.dbname
-
-        await r.table_create(cls._tablename, **create_args).run(cn)
-
-        # create secondary indexes for fields that have indexed == True
-        for fld in cls._declared_fields_objects.values():
-            if fld.indexed:
-                await cls.cq().index_create(fld.dbname).run(cn)
+        if cls._pkey_dbname != "id":
+            create_args["primary_key"] = cls._pkey_dbname
+
+        # just try to create the table, instead of checking whether it exists
+        # first (which would cost another query)
+        try:
+            await r.table_create(cls._tablename, **create_args).run(cn)
+        except r.ReqlOpFailedError as e:
+            if "already exists" in e.message:
+                raise AlreadyExistsError("table {} already exists"
+                        .format(cls._tablename)) from e
+            raise
+
+        # create secondary indexes for fields that have indexed == True, and
+        # wait until they are ready. All of this happens in one query: the
+        # array of index_create terms is evaluated (i.e. all indexes are
+        # created) before index_wait runs.
+        index_names = [ fld_dbname
+                for _, fld_dbname, fld_obj in cls._fields_items
+                if fld_obj.indexed ]
+        if index_names:
+            cq = cls.cq()
+            await r.expr([ cq.index_create(index_name)
+                for index_name in index_names ]).\
+                        do(lambda created: cq.index_wait(*index_names)).\
+                        run(cn)
 
         await cls._create_table_extras(cn)
 
@@ -210,14 +475,16 @@ class Document(FieldContainer, metaclass = _MetaDocument):
     def cq(cls):
         """RethinkDB query prefix for queries on the Document's DB table.
         """
-        return r.table(cls._tablename)
+        return cls._cq_term
 
 
     @classmethod
-    async def aiter_table_changes(cls, changes_query = None, conn = None):
+    async def aiter_table_changes(cls, changes_query = None, conn = None,
+            include_message = True, reuse_instance = False, **run_kwargs):
         """Executes `changes_query` and returns an asynchronous iterator (a
         ``ChangesAsyncMap``) that yields (document object, changefeed message)
-        tuples.
+        tuples. With ``include_message = False``, it yields only the document
+        objects (using a ``ChangesAsyncMapValuesOnly``).
 
         If `changes_query` is None, `cls.cq().changes(include_types = True)`
         will be used, so the iterator will yield all new or changed documents
@@ -233,16 +500,33 @@ class Document(FieldContainer, metaclass = _MetaDocument):
           awaitable) is just awaited. This gives the caller the opportunity to
           customize the run() call.
         * if run() has not been called, then the query is run on the given
-          connection (or the default connection). This is more convenient for
-          the caller than the former version.
+          connection (or the default connection), passing on `run_kwargs` to
+          run(). This is more convenient for the caller than the former
+          version.
+
+        With ``reuse_instance = True``, the iterator makes only one document
+        object and overwrites it in place with every message (using
+        ``_populate_from_doc``), instead of making a new object per message.
+        This saves allocations on busy changefeeds, but BEWARE: every
+        document the iterator yields is the very same object, so it is only
+        valid until the next iteration. Don't keep references to it around
+        (copy what you need), and don't hand it to other tasks. Customized
+        ``from_doc`` methods are not called in this mode.
         """
         if changes_query == None:
             changes_query = cls.cq().changes(include_types = True)
 
-        feed = await _run_query(changes_query)
-        mapper = functools.partial(cls.from_doc, stored_in_db = True) 
+        changes_query, new_vals_only = _without_status_messages(changes_query)
+        feed = await _run_query(changes_query, conn, **run_kwargs)
+        if reuse_instance:
+            mapper = cls._reusing_doc_mapper()
+        else:
+            mapper = cls._doc_mapper()
 
-        return ChangesAsyncMap(feed, mapper)
+        if include_message:
+            return ChangesAsyncMap(feed, mapper, new_vals_only = new_vals_only)
+        return ChangesAsyncMapValuesOnly(feed, mapper,
+                new_vals_only = new_vals_only)
 
 
     @classmethod
@@ -259,13 +543,92 @@ class Document(FieldContainer, metaclass = _MetaDocument):
         return obj
 
 
+    @classmethod
+    async def load_many(cls, pkey_vals, conn = None):
+        """Loads many objects from the database with one query, using their
+        primary keys for identification. Returns a dict { primary key value :
+        object }. Primary keys that don't match any document are not in the
+        dict (no NotFoundError is raised), and primary keys that are given
+        more than once are loaded only once.
+        """
+        pkey_vals = list(pkey_vals)
+        if not pkey_vals:
+            return {}
+
+        cn = await _resolve_conn(conn)
+        cursor = await cls.cq().get_all(*pkey_vals).run(cn)
+        objs = await cls.from_cursor(cursor).as_list(
+                size_hint = len(pkey_vals))
+
+        pkey_name = cls._pkey_name
+        return { getattr(obj, pkey_name): obj for obj in objs }
+
+
     @classmethod
     def from_doc(cls, doc, stored_in_db, **kwargs):
-        obj = super().from_doc(doc, **kwargs)
+        from_doc_impl = cls._from_doc_impl
+        if from_doc_impl is None:
+            raise TypeError("from_doc can only make objects of Document "
+                    "subclasses, not of {}".format(cls.__name__))
+        if kwargs:
+            # the compiled from_doc knows nothing about extra arguments
+            obj = super().from_doc(doc, **kwargs)
+        else:
+            # NB this does what super().from_doc does, only faster
+            obj = from_doc_impl(doc)
         obj._stored_in_db = stored_in_db
         return obj
 
 
+    @classmethod
+    def _doc_mapper(cls):
+        if cls.from_doc.__func__ is not Document.from_doc.__func__:
+            # a subclass customizes from_doc, so we have to go through it
+            return super()._doc_mapper()
+
+        # skip partial(cls.from_doc, ...) and the indirection in from_doc,
+        # as the mapper runs for each document in a cursor or changefeed
+        from_doc_impl = cls._from_doc_impl
+        def mapper(doc):
+            obj = from_doc_impl(doc)
+            obj._stored_in_db = True
+            return obj
+        return mapper
+
+
+    @classmethod
+    def _reusing_doc_mapper(cls):
+        """Like _doc_mapper, but the returned function populates one and the
+        same cls instance with every document (see aiter_table_changes).
+        """
+        obj = cls()
+        obj._stored_in_db = True
+        populate = cls._populate_from_doc
+        def mapper(doc):
+            populate(obj, doc)
+            return obj
+        return mapper
+
+
+    @classmethod
+    def _populate_from_doc(cls, obj, doc):
+        """Resets the field values of `obj` (an instance of cls) and fills
+        them in from `doc` (as read from the DB), reusing obj's containers.
+        """
+        obj._declared_fields_values.clear()
+        obj._updated_fields.clear()
+        undeclared = obj._undeclared_fields
+        undeclared.clear()
+
+        dbname_to_field = cls._dbname_to_field
+        for dbkey, dbval in doc.items():
+            fld_obj = dbname_to_field.get(dbkey, None)
+            if fld_obj is not None:
+                fld_obj._store_from_doc(obj, dbval, mark_updated = False)
+            else:
+                undeclared[dbkey] = dbval
+
+
     @classmethod
     async def create(cls, **kwargs):
         """Makes a Document and saves it into the DB. Use keyword arguments for
@@ -276,6 +639,64 @@ class Document(FieldContainer, metaclass = _MetaDocument):
         return obj
 
 
+    @classmethod
+    async def bulk_create(cls, docs, conn = None, batch_size = 1000):
+        """Saves many new Documents into the DB at once. `docs` is an iterable
+        of Documents (of this class) that have not been saved yet. Instead of
+        one insert query per document, as with save() or create(), there is
+        one insert query per `batch_size` documents.
+
+        Primary keys generated by the DB are stored in the documents, just like
+        with save(). Returns the list of insert query results (one per batch).
+        Check their "errors" and "first_error": documents that the DB refused
+        to insert (for instance because of a duplicate primary key) are not
+        marked as stored in the DB.
+        """
+        docs = list(docs)
+        if not docs:
+            return []
+        for doc in docs:
+            if doc._stored_in_db:
+                raise AlreadyExistsError("{} is already stored in the DB"
+                        .format(doc))
+            doc.validate_all()
+
+        cn = await _resolve_conn(conn)
+
+        insert_results = []
+        for start in range(0, len(docs), batch_size):
+            batch = docs[start:start + batch_size]
+            # with return_changes = "always", there's one entry in "changes"
+            # per document, in order, telling whether it made it into the DB
+            insert_result = await cls.cq().\
+                    insert([ doc._make_insert_dict() for doc in batch ],
+                            return_changes = "always").\
+                    run(cn)
+            insert_results.append(insert_result)
+            cls._mark_inserted(batch, insert_result["changes"])
+
+        return insert_results
+
+
+    @classmethod
+    def _mark_inserted(cls, batch, changes):
+        """Marks the documents of a bulk insert batch that made it into the DB
+        as stored, and stores the keys that the DB generated in those that had
+        no primary key. `changes` is the insert result's "changes" list (one
+        entry per document).
+        """
+        pkey = cls.pkey
+        pkey_name = cls._pkey_name
+        pkey_dbname = cls._pkey_dbname
+        for doc, change in zip(batch, changes):
+            if "error" in change:
+                continue
+            if getattr(doc, pkey_name) is None:
+                pkey._store_from_doc(doc, change["new_val"][pkey_dbname])
+            doc._updated_fields.clear()
+            doc._stored_in_db = True
+
+
     def q(self):
         """RethinkDB query prefix for queries on the document.
         """
@@ -284,63 +705,57 @@ class Document(FieldContainer, metaclass = _MetaDocument):
 
 
     async def save(self, conn = None):
-        cn = conn or await db_conn
+        # NB the connection is resolved by _update_in_db/_insert_into_db, so
+        # that saving an unchanged document doesn't need one at all
         if self._stored_in_db:
-            return await self._update_in_db(cn)
+            return await self._update_in_db(conn)
         else:
-            return await self._insert_into_db(cn)
+            return await self._insert_into_db(conn)
 
     async def _update_in_db(self, conn = None):
-        cn = conn or await db_conn
-        if len(self._updated_fields) == 0:
+        if not self._updated_fields:
             return
 
         self.validate()
+        cn = await _resolve_conn(conn)
 
         # make the dictionary for the DB query
+        declared_fields = self.__class__._declared_fields_objects
+        undeclared_fields = self._undeclared_fields
+        updated_fields = self._updated_fields
         update_dict = {}
-        for fld_name in self._updated_fields.keys():
-            if self.__class__.has_field_attr(fld_name):
-                # Field instance: convert field value to DB-serializable format
-                fld_obj = getattr(self.__class__, fld_name)
-                db_key = fld_obj.dbname
-                db_val = fld_obj._do_convert_to_doc(self)
-                update_dict[db_key] = db_val
+        for fld_name in updated_fields:
+            fld_obj = declared_fields.get(fld_name, None)
+            if fld_obj is not None:
+                ## Field instances: convert field value to DB-serializable
+                ## format
+                update_dict[fld_obj.dbname] = fld_obj._do_convert_to_doc(self)
             else:
-                # undeclared field: we assume that the value is serializable
-                update_dict[fld_name] = self._undeclared_fields.get(fld_name,
-                        None)
-                # NOTE the field might have been deleted from
-                # _undeclared_fields (see __delitem__). But since we can not
-                # remove fields from a RethinkDB document, we have to overwrite
-                # 'deleted' fields with something (here: None)...
-                # TODO: make replace() query then
+                ## undeclared fields: we assume that the values are
+                ## serializable
+                update_dict[fld_name] = undeclared_fields.get(fld_name, None)
+        # NOTE an undeclared field might have been deleted from
+        # _undeclared_fields (see __delitem__). But since we can not remove
+        # fields from a RethinkDB document, we have to overwrite 'deleted'
+        # fields with something (here: None)...
+        # TODO: make replace() query then
 
         # update in DB
-        self._updated_fields = {}
+        updated_fields.clear()
         return await self.q().\
                 update(update_dict).\
                 run(cn)
 
     async def _insert_into_db(self, conn = None):
-        cn = conn or await db_conn
+        cn = await _resolve_conn(conn)
 
-        self.validate()
+        self.validate_all()
 
         # make dict for the DB query
-        insert_dict = {}
-        for fld_name, fld_obj in self.__class__._declared_fields_objects.items():
-            # don't store if primary key and not set (then DB should autogenerate)
-            if fld_obj.primary_key and self.get(fld_name, None) == None:
-                continue
-            # convert field value to DB-serializable format
-            db_key = fld_obj.dbname
-            db_val = fld_obj._do_convert_to_doc(self)
-            insert_dict[db_key] = db_val
-        insert_dict.update(self._undeclared_fields)
+        insert_dict = self._make_insert_dict()
 
         # insert document into DB
-        self._updated_fields = {}
+        self._updated_fields.clear()
         insert_result = await self.__class__.cq().\
                 insert(insert_dict).\
                 run(cn)
@@ -353,9 +768,21 @@ class Document(FieldContainer, metaclass = _MetaDocument):
         self._stored_in_db = True
         return insert_result
 
+    def _make_insert_dict(self):
+        # NB Document subclasses get a compiled version of this (see
+        # _compile_insert_plan), which must do the same
+        # convert field values to DB-serializable format. Don't store the
+        # primary key if it's not set (then DB should autogenerate)
+        insert_dict = { db_key: convert(self)
+                for fld_name, db_key, primary_key, convert
+                in self.__class__._insert_plan
+                if not (primary_key and getattr(self, fld_name) is None) }
+        insert_dict.update(self._undeclared_fields)
+        return insert_dict
+
 
     async def delete(self, conn = None, **kwargs_delete):
-        cn = conn or await db_conn
+        cn = await _resolve_conn(conn)
         res = await self.q().delete(**kwargs_delete).run(cn)
         self._stored_in_db = False
         return res
@@ -367,7 +794,7 @@ class Document(FieldContainer, metaclass = _MetaDocument):
         Document is returned.
         """
         doc = super().copy(which)
-        del doc[self.__class__.pkey.name]
+        del doc[self.__class__._pkey_name]
         return doc
 
 
@@ -379,43 +806,56 @@ class Document(FieldContainer, metaclass = _MetaDocument):
         def __init__(self, doc, conn = None):
             self.doc = doc
             self.conn = conn
+            self.cursor = None # changefeed is started on first __anext__
 
 
-        async def __aiter__(self):
-            query = self.doc.q().changes(include_initial = True,
-                    include_types = True)
-            self.cursor = await _run_query(query, self.conn)
+        def __aiter__(self):
             return self
 
 
         async def __anext__(self):
+            if self.cursor is None:
+                query = self.doc.q().changes(include_initial = True,
+                        include_types = True)
+                self.cursor = await _run_query(query, self.conn)
+
+            next_message = self.cursor.next
+            doc = self.doc
+            dbname_to_field = doc.__class__._dbname_to_field
+            undeclared_fields = doc._undeclared_fields
             while True:
                 try:
-                    msg = await self.cursor.next()
-                except r.ReqlCursorEmpty:
+                    msg = await next_message()
+                except _ReqlCursorEmpty:
                     raise StopAsyncIteration
 
-                if "new_val" not in msg:
+                new_val = msg.get("new_val", _NO_NEW_VAL)
+                if new_val is _NO_NEW_VAL:
                     continue
 
-                doc = self.doc
-
                 # update doc and return changed fields
-                if msg["new_val"] == None:
+                if new_val is None:
                     doc._stored_in_db = False
                     return doc, None, msg
-                else:
-                    changed_fields = {k: v for k, v in msg["new_val"].items()
-                            if k not in doc or v != doc.get_dbvalue(k)}
-
-                    if not changed_fields:
-                        continue
-
-                    for k, v in changed_fields.items():
-                        doc_key = doc.get_key_for_dbkey(k)
-                        doc.set_dbvalue(doc_key, v, mark_updated = False)
 
-                    return doc, list(changed_fields.keys()), msg
+                # update fields whose values differ from the doc's, and
+                # collect their db keys
+                changed_dbkeys = []
+                for k, v in new_val.items():
+                    fld_obj = dbname_to_field.get(k, None)
+                    if fld_obj is not None:
+                        if v == fld_obj._do_convert_to_doc(doc):
+                            continue
+                        fld_obj._store_from_doc(doc, v, mark_updated = False)
+                    else:
+                        if k in undeclared_fields and \
+                                v == undeclared_fields[k]:
+                            continue
+                        undeclared_fields[k] = v
+                    changed_dbkeys.append(k)
+
+                if changed_dbkeys:
+                    return doc, changed_dbkeys, msg
 
 
     async def aiter_changes(self, conn = None):
@@ -1,10 +1,15 @@
+import sys
+
 from .errors import IllegalAccessError, IllegalSpecError, ValidationError
-from .values_and_valuetypes import AnyValueType, LazyValueType
 
 
 __all__ = [ "Field", "FieldAlias" ]
 
 
+def _validate_nothing(val):
+    pass
+
+
 class Field:
     """Field instances are attached to FieldContainer classes as class attributes.
 
@@ -14,7 +19,14 @@ class Field:
 
     A Field instance has an associated ValueType instance, which takes care of
     DB<->Python world value conversion and value validation.
+
+    Field subclasses that add attributes of their own should declare
+    ``__slots__`` for them, too. Otherwise their instances get a ``__dict__``
+    again.
     """
+    __slots__ = ("_name", "_dbname", "_indexed", "_required", "_primary_key",
+            "_default", "_val_type", "_validate_fast", "_validate_on_set",
+            "_to_dbval", "_from_dbval")
 
     def __init__(self, val_type = None, **kwargs):
         """``val_type`` is a ``ValueType`` or None (in which case it's just
@@ -29,13 +41,16 @@ class Field:
             False and required must be True.
         default: default value (which defaults to None).
         """
-        self.val_type = val_type or AnyValueType()
-
+        if val_type is None:
+            # imported here because values_and_valuetypes imports this module
+            from .values_and_valuetypes import AnyValueType
+            val_type = AnyValueType()
         self._name = None
 
         # get field properties from kwargs
         self._indexed = kwargs.pop("indexed", False)
         self._required = kwargs.pop("required", False)
+        self.val_type = val_type # sets up _validate_fast, too
         self._primary_key = kwargs.pop("primary_key", False)
         if self._primary_key:
             if self._indexed:
@@ -61,13 +76,52 @@ class Field:
     # simple properties and due diligence
     ###########################################################################
 
+    @property
+    def val_type(self):
+        return self._val_type
+
+    @val_type.setter
+    def val_type(self, val_type):
+        self._val_type = val_type
+
+        # validate() calls this for the value type part of the validation.
+        # A plain AnyValueType accepts anything, so we skip calling its
+        # validate() (which would look up and run the validator cascade)
+        from .values_and_valuetypes import AnyValueType
+        if type(val_type) is AnyValueType and \
+                val_type._extra_validators is None and \
+                not val_type._forbid_none:
+            self._validate_fast = _validate_nothing
+        else:
+            self._validate_fast = val_type.validate
+
+        # __set__ validates with this, or not at all if validation can't fail
+        if self._validate_fast is _validate_nothing and \
+                not self._required and type(self).validate is Field.validate:
+            self._validate_on_set = None
+        else:
+            self._validate_on_set = self.validate
+
+        # the value type's conversion methods, bound once. None means that
+        # the value type doesn't convert (it inherits AnyValueType's
+        # conversions, which just return the value)
+        val_type_cls = type(val_type)
+        if val_type_cls.pyval_to_dbval is AnyValueType.pyval_to_dbval:
+            self._to_dbval = None
+        else:
+            self._to_dbval = val_type.pyval_to_dbval
+        if val_type_cls.dbval_to_pyval is AnyValueType.dbval_to_pyval:
+            self._from_dbval = None
+        else:
+            self._from_dbval = val_type.dbval_to_pyval
+
     @property
     def name(self):
         return self._name
 
     @name.setter
     def name(self, val):
-        self._name = val
+        self._name = sys.intern(val)
 
     @property
     def dbname(self):
@@ -89,12 +143,22 @@ class Field:
     def default(self):
         return self._default
 
+    def __set_name__(self, owner, name):
+        # called when the FieldContainer class that self is declared in is
+        # made. The name is the key for the field's value in every
+        # instance's values dict, so we intern it: dict lookups with the
+        # same (identical) string object skip the string comparison
+        self._name = sys.intern(name)
+
     def __repr__(self):
-        s = ("{cls}(name={self.name}, dbname={self.dbname}, indexed={self."
-                "indexed}, required="
-                "{self.required}, default={self.default}, primary_key="
-                "{self.primary_key})")
-        return s.format(cls = self.__class__, self = self)
+        # NB the private attributes, not the properties: same values, but
+        # without a property call for each
+        s = ("{cls}(name={self._name}, dbname={dbname}, indexed={self."
+                "_indexed}, required="
+                "{self._required}, default={self._default}, primary_key="
+                "{self._primary_key})")
+        return s.format(cls = self.__class__, self = self,
+                dbname = self._dbname or self._name)
 
 
     ###########################################################################
@@ -102,18 +166,30 @@ class Field:
     ###########################################################################
 
     def __get__(self, obj, cls):
-        if obj == None:
+        # NB 'is None': obj == None would call the FieldContainer's __eq__
+        if obj is None:
             return self # __get__ was called on class, not instance
         return obj._declared_fields_values.get(self._name, self._default)
 
 
     def __set__(self, obj, val, mark_updated = True):
-        self.validate(val)
+        if self._validate_on_set is not None:
+            self._validate_on_set(val)
         obj._declared_fields_values[self._name] = val
         if mark_updated:
             obj.mark_field_updated(self._name)
 
 
+    def _set_quiet(self, obj, val):
+        """Same as ``__set__(obj, val, mark_updated = False)``, without the
+        keyword argument and the branch. For internal use, e.g. for values
+        that come from the DB.
+        """
+        if self._validate_on_set is not None:
+            self._validate_on_set(val)
+        obj._declared_fields_values[self._name] = val
+
+
     def __delete__(self, obj):
         if self._name in obj._declared_fields_values:
             del obj._declared_fields_values[self._name]
@@ -128,13 +204,21 @@ class Field:
     # use it in changefeeds...
 
     def _do_convert_to_doc(self, obj):
+        # NB no validation here: values are validated when they are set, and
+        # containers validate all their fields before they are stored (see
+        # FieldContainer.validate_all)
         val = self.__get__(obj, None)
-        self.validate(val) # TODO do we validate too often?
-        return self.val_type.pyval_to_dbval(val)
+        if self._to_dbval is None:
+            return val
+        return self._to_dbval(val)
 
     def _store_from_doc(self, obj, dbval, mark_updated = False):
-        val = self.val_type.dbval_to_pyval(dbval)
-        self.__set__(obj, val, mark_updated = mark_updated)
+        if self._from_dbval is not None:
+            dbval = self._from_dbval(dbval)
+        if mark_updated:
+            self.__set__(obj, dbval)
+        else:
+            self._set_quiet(obj, dbval)
 
 
     ###########################################################################
@@ -142,11 +226,11 @@ class Field:
     ###########################################################################
 
     def validate(self, val):
-        if val == None and self._required:
+        if val is None and self._required:
             raise ValidationError("no value for required property {}"
                     .format(self._name))
         else:
-            self.val_type.validate(val)
+            self._validate_fast(val)
             return self
 
 
@@ -164,11 +248,19 @@ class FieldAlias:
 
     A FieldAlias simply dispatches all attribute accesses to the target field.
     """
+    __slots__ = ("_target_field", "_do_convert_to_doc", "_store_from_doc",
+            "validate")
 
     def __init__(self, target):
         super().__init__()
         self._target_field = target
 
+        # the target's methods that aiorethink calls on aliases (e.g. on
+        # pkey), bound once so that calls don't go through __getattr__
+        self._do_convert_to_doc = target._do_convert_to_doc
+        self._store_from_doc = target._store_from_doc
+        self.validate = target.validate
+
     def __repr__(self):
         s = "{self.__class__.__name__}(fld_name={self.name})"
         return s.format(self = self)
@@ -176,15 +268,50 @@ class FieldAlias:
     __str__ = __repr__
 
     def __getattr__(self, name):
+        # for everything not covered by the properties below
         return getattr(self._target_field, name)
 
 
+    ###########################################################################
+    # Field properties, dispatched explicitly (__getattr__ is only called
+    # after regular attribute lookup has failed, which is slow)
+    ###########################################################################
+
+    @property
+    def name(self):
+        return self._target_field._name
+
+    @property
+    def dbname(self):
+        return self._target_field.dbname
+
+    @property
+    def val_type(self):
+        return self._target_field._val_type
+
+    @property
+    def indexed(self):
+        return self._target_field._indexed
+
+    @property
+    def required(self):
+        return self._target_field._required
+
+    @property
+    def primary_key(self):
+        return self._target_field._primary_key
+
+    @property
+    def default(self):
+        return self._target_field._default
+
+
     ###########################################################################
     # Descriptor protocol (because it's not dispatched by __getattr__)
     ###########################################################################
 
     def __get__(self, obj, cls):
-        if obj == None:
+        if obj is None:
             return self # __get__ was called on class, not instance
         return self._target_field.__get__(obj, cls)
 
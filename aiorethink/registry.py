@@ -38,16 +38,36 @@ class DocumentRegistry(MutableMapping):
     def __len__(self):
         return len(self._classes)
 
+    # MutableMapping's mixin versions of these go through the methods above
+    # item by item (clear() pops one item at a time). The dict can do it
+    # directly
+    def get(self, class_name, default = None):
+        return self._classes.get(class_name, default)
+
+    def keys(self):
+        return self._classes.keys()
+
+    def values(self):
+        return self._classes.values()
+
+    def items(self):
+        return self._classes.items()
+
+    def clear(self):
+        self._classes.clear()
+
 
     def resolve(self, class_or_name):
         """Convenience function: resolve a Document class either directly (if
         class_or_name is a class) or by lookup in the registry (if
         class_or_name is a string).
         """
-        if isinstance(class_or_name, type):
+        # names are the common case. Look them up in _classes directly,
+        # not through the mapping interface
+        if isinstance(class_or_name, str):
+            return self._classes[class_or_name]
+        elif isinstance(class_or_name, type):
             return class_or_name
-        elif isinstance(class_or_name, str):
-            return self[class_or_name]
         else:
             raise TypeError
 
@@ -1,6 +1,37 @@
-from .base_types import *
-from .simple_types import *
-from .simple_containers import *
-from .lazy import *
-from .field_container import *
-from .reference import *
+import importlib
+
+from .base_types import AnyValueType, TypedValueType
+from .simple_types import IntValueType, StringValueType
+from .simple_containers import TupleValueType, ListValueType, SetValueType, \
+        DictValueType, NamedTupleValueType
+from .lazy import LazyValue, LazyValueType
+from .field_container import FieldContainer, FieldContainerValueType
+
+# reference needs aiorethink.document, which in turn needs this package, so
+# it's imported on first access (PEP 562)
+_lazy_names = { name: ".reference" for name in [
+    "LazyDocRefValueType", "LazyDocRef", "lazy_doc_ref", "lval" ] }
+
+
+def __getattr__(name):
+    try:
+        module_name = _lazy_names[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                .format(__name__, name)) from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # don't come here again for this name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
+
+
+__all__ = [ "AnyValueType", "TypedValueType",
+        "IntValueType", "StringValueType",
+        "TupleValueType", "ListValueType", "SetValueType", "DictValueType",
+        "NamedTupleValueType",
+        "LazyValue", "LazyValueType",
+        "FieldContainer", "FieldContainerValueType",
+        ] + list(_lazy_names)
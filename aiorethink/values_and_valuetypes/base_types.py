@@ -4,6 +4,27 @@ from ..errors import StopValidation, ValidationError
 __all__ = ["AnyValueType", "TypedValueType"]
 
 
+def _compile_validate_chain(validate_chain):
+    """Makes a function that calls the _validate methods in validate_chain
+    one after the other, as straight-line code rather than a loop over the
+    chain. For a chain of two, the source code we compile looks like this::
+
+        def _run_validate_chain(self, val):
+            _validate_0(self, val)
+            _validate_1(self, val)
+    """
+    lines = [ "def _run_validate_chain(self, val):" ]
+    namespace = {}
+    for i, validator in enumerate(validate_chain):
+        validator_name = "_validate_{}".format(i)
+        namespace[validator_name] = validator
+        lines.append("    {}(self, val)".format(validator_name))
+
+    exec(compile("\n".join(lines), "<aiorethink validate chain>", "exec"),
+            namespace)
+    return namespace["_run_validate_chain"]
+
+
 class AnyValueType:
     """An instance of ValueType describes for some type of value (int, "int
     between 0 and 10", list, "list with elements of value type
@@ -81,29 +102,12 @@ class AnyValueType:
         self._forbid_none = forbid_none
 
 
-    @classmethod
-    def _find_methods_in_reverse_mro(cls, name):
-        """Collects methods with matching name along the method resolution
-        order in a list, reverses that list, and returns it.
-        """
-        # we have a cache for this. See if we get a hit for name
-        cache = cls.__dict__.get("_find_methods_cache", None)
-        if cache == None:
-            cls._find_methods_cache = cache = {}
-        else:
-            methods = cache.get(name, None)
-            if methods != None:
-                return methods
-
-        # still here? then we need to do the work
-        methods = []
-        for c in cls.__mro__:
-            method = c.__dict__.get(name, None)
-            if method != None:
-                methods.append(method)
-        methods.reverse()
-        cache[name] = methods
-        return methods
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the _validate methods along the MRO, most basic one first
+        cls._run_validate_chain = _compile_validate_chain(reversed([
+            c.__dict__["_validate"]
+            for c in cls.__mro__ if "_validate" in c.__dict__ ]))
 
 
     ###########################################################################
@@ -119,7 +123,7 @@ class AnyValueType:
         If you need the validation cascade to stop after this validator, raise
         StopValidation.
         """
-        if val == None and self._forbid_none:
+        if val is None and self._forbid_none:
             raise ValidationError("None is not an allowed value.")
 
 
@@ -132,17 +136,16 @@ class AnyValueType:
         Aiorethink users don't have to call this function directly, as
         aiorethink calls it implicitly when necessary.
         """
-        validators = self.__class__._find_methods_in_reverse_mro("_validate")
-
-        if self._extra_validators != None:
-            validators = validators[:]
-            validators.extend(self._extra_validators)
-
-        for validator in validators:
-            try:
-                validator(self, val)
-            except StopValidation as s:
-                break
+        # NB the class's validators run as one compiled function (see
+        # _compile_validate_chain). The extra validators are per object, so
+        # they stay a loop, run after the class's validators
+        try:
+            self.__class__._run_validate_chain(self, val)
+            if self._extra_validators:
+                for validator in self._extra_validators:
+                    validator(self, val)
+        except StopValidation:
+            pass
         return self
 
 
@@ -164,6 +167,12 @@ class AnyValueType:
         """
         return dbval
 
+# a function that runs the _validate methods along the MRO, in the order
+# validate() runs them. Subclasses get theirs from __init_subclass__ when they
+# are made.
+AnyValueType._run_validate_chain = _compile_validate_chain(
+        (AnyValueType._validate,))
+
 
 
 class TypedValueType(AnyValueType):
@@ -174,6 +183,6 @@ class TypedValueType(AnyValueType):
 
     def _validate(self, val):
         oktype = self._val_instance_of
-        if val != None and not isinstance(val, oktype):
+        if val is not None and not isinstance(val, oktype):
             raise ValidationError("value {} is not an instance of {}, but "
                 "{}".format(repr(val), str(oktype), str(val.__class__)))
@@ -1,6 +1,5 @@
 import collections
 import functools
-import inspect
 import abc
 import itertools
 
@@ -9,17 +8,58 @@ import rethinkdb as r
 from .. import ALL, DECLARED_ONLY, UNDECLARED_ONLY
 from ..errors import IllegalSpecError, AlreadyExistsError
 from ..db import db_conn, CursorAsyncMap, _run_query
-from ..field import Field, FieldAlias
+from ..field import Field, FieldAlias, _validate_nothing
 from .base_types import TypedValueType
 
 __all__ = [ "FieldContainer", "FieldContainerValueType" ]
 
 
+def _compile_to_doc(to_doc_plan):
+    """Makes a function that does what FieldContainer.to_doc does, but with
+    the loop over to_doc_plan unrolled into one dict display. The source code
+    we compile looks like this::
+
+        def to_doc(self):
+            values = self._declared_fields_values
+            d = {
+                'plain_field': values.get('plain_field', _default_0),
+                'some_field': _convert_1(self),
+                }
+            d.update(self._undeclared_fields)
+            return d
+    """
+    lines = [ "def to_doc(self):",
+            "    values = self._declared_fields_values",
+            "    d = {" ]
+    namespace = {}
+    for i, (fld_dbname, fld_name, default, convert) in enumerate(to_doc_plan):
+        if convert is None:
+            default_name = "_default_{}".format(i)
+            namespace[default_name] = default
+            lines.append("        {!r}: values.get({!r}, {}),"
+                    .format(fld_dbname, fld_name, default_name))
+        else:
+            convert_name = "_convert_{}".format(i)
+            namespace[convert_name] = convert
+            lines.append("        {!r}: {}(self),"
+                    .format(fld_dbname, convert_name))
+    lines.extend([ "        }",
+        "    d.update(self._undeclared_fields)",
+        "    return d" ])
+
+    exec(compile("\n".join(lines), "<aiorethink to_doc>", "exec"), namespace)
+    func = namespace["to_doc"]
+    func.__doc__ = FieldContainer.to_doc.__doc__
+    func._compiled_to_doc = True
+    return func
+
+
 class _MetaFieldContainer(abc.ABCMeta):
 
     def __init__(cls, name, bases, classdict):
         cls._map_declared_fields()
         cls._check_field_spec()
+        cls._cache_field_spec()
 
         super().__init__(name, bases, classdict)
 
@@ -38,11 +78,27 @@ class FieldContainer(collections.abc.MutableMapping,
     can act as a "value". An associated ValueType class,
     FieldContainerValueType, makes it possible to use FieldContainer values
     "anywhere".
+
+    FieldContainer keeps its per-instance state in __slots__. If you make lots
+    of instances of a subclass, declare ``__slots__ = ()`` in the subclass as
+    well, so that its instances don't get a __dict__ either. (Fields are class
+    attributes, so they work with that just fine.)
     """
+    __slots__ = ("_declared_fields_values", "_updated_fields",
+            "_undeclared_fields", "__weakref__")
+
     _declared_fields_objects = {} # { attr name : Field instance }.
                                   # Each subclass has its own version of this.
     _dbname_to_field_name = {} # { db name : field name }
                                # Each subclass has its own version of this.
+    # the following are derived from the above (see _cache_field_spec), for
+    # quick access in hot paths
+    _fields_items = () # ( (attr name, db name, Field instance), ... )
+    _to_doc_plan = () # ( (db name, attr name, default, conversion func), ... )
+    _dbname_to_field = {} # { db name : Field instance }
+    _field_attr_names = frozenset() # names of Field and FieldAlias attributes
+    _fields_to_validate = {} # { attr name : Field instance } for fields
+                             # where validation can fail
 
 
     def __init__(self, **kwargs):
@@ -52,12 +108,17 @@ class FieldContainer(collections.abc.MutableMapping,
         super().__init__()
 
         self._declared_fields_values = {} # { attr name : object }
-        self._updated_fields = {}
+        self._updated_fields = set()
         self._undeclared_fields = {}
 
-        # set fields given in kwargs
+        # set fields given in kwargs. Declared fields (and aliases) are set
+        # right here, which is what __setitem__ would do for them, too
+        field_attr_names = self._field_attr_names
         for k, v in kwargs.items():
-            self[k] = v
+            if k in field_attr_names:
+                setattr(self, k, v)
+            else:
+                self[k] = v
 
 
     ###########################################################################
@@ -80,38 +141,29 @@ class FieldContainer(collections.abc.MutableMapping,
             cls._dbname_to_field_name.update(
                     getattr(base, "_dbname_to_field_name", {}))
 
-        # then, update all fields we find in *this* class
-        for name in dir(cls):
-            attr = getattr(cls, name, None)
-
-            if isinstance(attr, Field):
-                # check whether the field is inherited, and if we override an
-                # inherited non-Field attribute (the latter is verboten). Note
-                # that both are possible when we deal with multiple
-                # inheritance.
-                attr_is_inherited = False
-                attr_overwrites_nonfield = False
-                for base in cls.__bases__:
-                    if hasattr(base, name):
-                        base_attr = getattr(base, name)
-                        if base_attr == attr:
-                            attr_is_inherited = True
-                        elif not isinstance(base_attr, Field):
-                            attr_overwrites_nonfield = True
-
-                # bail out if we got an illegal field name
-                if attr_overwrites_nonfield:
+        # then, add the fields defined in *this* class (they might override
+        # Fields from a parent class, which is technically fine). Fields
+        # usually get their names from __set_name__ when the class is made.
+        for name, attr in cls.__dict__.items():
+            if not isinstance(attr, Field):
+                continue
+
+            # bail out if we got an illegal field name, i.e. if the field
+            # overrides an inherited non-Field attribute. (One getattr per
+            # base: if the base doesn't have the attribute, we get attr, which
+            # is a Field)
+            for base in cls.__bases__:
+                if not isinstance(getattr(base, name, attr), Field):
                     raise IllegalSpecError("Illegal field name {} "
                         "(would overwrite a non-Field attribute of same name "
                         "defined in an ancestor class).".format(name))
 
-                # add field to our dicts if it's defined in this class (it
-                # might override a Field from a parent class but that is
-                # technically fine)
-                if not attr_is_inherited:
-                    attr.name = name
-                    cls._declared_fields_objects[attr.name] = attr
-                    cls._dbname_to_field_name[attr.dbname] = attr.name
+            # ... but not when they're added to the class later on with
+            # setattr()
+            if attr.name is None:
+                attr.name = name
+            cls._declared_fields_objects[name] = attr
+            cls._dbname_to_field_name[attr.dbname] = name
 
 
     @classmethod
@@ -122,6 +174,53 @@ class FieldContainer(collections.abc.MutableMapping,
         pass
 
 
+    @classmethod
+    def _cache_field_spec(cls):
+        """Precompute what hot paths need to know about the class's fields, so
+        that they don't have to look it up field by field. Runs after
+        _check_field_spec (which may add fields).
+        """
+        cls._fields_items = tuple((fld_name, fld_obj.dbname, fld_obj)
+                for fld_name, fld_obj in cls._declared_fields_objects.items())
+        cls._dbname_to_field = { fld_dbname: fld_obj
+                for _, fld_dbname, fld_obj in cls._fields_items }
+        # for to_doc: fields whose DB value is just their value (plain Fields
+        # with a value type that doesn't convert) are read from the values
+        # dict directly; the others have a conversion function
+        cls._to_doc_plan = tuple(
+                (fld_dbname, fld_name, fld_obj.default, None)
+                if type(fld_obj) is Field and fld_obj._to_dbval is None else
+                (fld_dbname, None, None, fld_obj._do_convert_to_doc)
+                for fld_name, fld_dbname, fld_obj in cls._fields_items)
+        # ... and a to_doc made just for this class from that, unless the
+        # class (or a parent) brings its own. NB this doesn't run for
+        # FieldContainer itself (which isn't known by name yet when it's made)
+        if cls.__bases__ != (collections.abc.MutableMapping,) and \
+                (getattr(cls.to_doc, "_compiled_to_doc", False) or
+                    cls.to_doc is FieldContainer.to_doc):
+            cls.to_doc = _compile_to_doc(cls._to_doc_plan)
+        # fields that aren't required and have a value type that accepts
+        # anything can't fail validation, so validate_fields skips them
+        cls._fields_to_validate = { fld_name: fld_obj
+                for fld_name, _, fld_obj in cls._fields_items
+                if type(fld_obj) is not Field or fld_obj.required or
+                    fld_obj._validate_fast is not _validate_nothing }
+
+        # names of Field and FieldAlias attributes (see has_field_attr): the
+        # ones we inherit, unless this class overrides them with something
+        # else, plus the ones defined in this class
+        attr_names = set()
+        for base in cls.__bases__:
+            attr_names.update(getattr(base, "_field_attr_names", ()))
+        for name, attr in cls.__dict__.items():
+            if isinstance(attr, (Field, FieldAlias)):
+                attr_names.add(name)
+            else:
+                attr_names.discard(name)
+        attr_names.update(cls._declared_fields_objects)
+        cls._field_attr_names = frozenset(attr_names)
+
+
     ###########################################################################
     # simple properties and due diligence
     ###########################################################################
@@ -131,21 +230,21 @@ class FieldContainer(collections.abc.MutableMapping,
         return s.format(o = self, str_rep = str(self))
 
     def __str__(self):
-        return str(collections.ChainMap(self._declared_fields_values,
-            self._undeclared_fields))
+        # one merged dict, declared fields first; they win over undeclared
+        # ones of the same name, as in __getitem__
+        fields = dict(self._declared_fields_values)
+        for name, value in self._undeclared_fields.items():
+            fields.setdefault(name, value)
+        return str(fields)
 
 
     def mark_field_updated(self, name):
-        self._updated_fields[name] = None
+        self._updated_fields.add(name)
 
 
     @classmethod
     def has_field_attr(cls, fld_name):
-        attr = getattr(cls, fld_name, None)
-        if isinstance(attr, Field) or isinstance(attr, FieldAlias):
-            return True
-        else:
-            return False
+        return fld_name in cls._field_attr_names
 
 
 
@@ -169,13 +268,27 @@ class FieldContainer(collections.abc.MutableMapping,
             all_docs_cursor = MyDocument.cq().run(conn)
             async for doc in MyDocument.from_cursor(all_docs_cursor):
                 assert isinstance(doc, MyDocument) # holds
+
+        For large result sets, ``batches()`` on the returned object yields the
+        loaded objects a whole batch (a list) at a time::
+
+            async for docs in MyDocument.from_cursor(all_docs_cursor).batches():
+                ...
+        """
+        return CursorAsyncMap(cursor, cls._doc_mapper())
+
+
+    @classmethod
+    def _doc_mapper(cls):
+        """Returns a function that makes a cls instance from a document that
+        has been read from the DB, for mapping over cursors and changefeeds.
         """
-        return CursorAsyncMap(cursor, functools.partial(
-            cls.from_doc, stored_in_db = True)) # TODO remove stored_in_db?
+        return functools.partial(
+            cls.from_doc, stored_in_db = True) # TODO remove stored_in_db?
 
 
     @classmethod
-    async def from_query(cls, query, conn = None):
+    async def from_query(cls, query, conn = None, **run_kwargs):
         """First executes a ReQL query, and then, depending on the query,
         returns either no object (empty result), one FieldContainer object
         (query returns an object), or an asynchronous iterator over
@@ -188,8 +301,9 @@ class FieldContainer(collections.abc.MutableMapping,
           awaitable) is just awaited. This gives the caller the opportunity to
           customize the run() call.
         * if run() has not been called, then the query is run on the given
-          connection (or the default connection). This is more convenient for
-          the caller than the former version.
+          connection (or the default connection), passing on `run_kwargs` to
+          run() (see ``aiorethink.db._run_query``). This is more convenient
+          for the caller than the former version.
 
         If the query returns None, then the method returns None.
 
@@ -203,7 +317,7 @@ class FieldContainer(collections.abc.MutableMapping,
         ``aiorethink.db.CursorAsyncMap`` object, an asynchronous iterator over
         FieldContainer objects).
         """
-        res = await _run_query(query, conn)
+        res = await _run_query(query, conn, **run_kwargs)
 
         if res == None:
             return None
@@ -221,15 +335,17 @@ class FieldContainer(collections.abc.MutableMapping,
 
         # construct field values from doc and store them in FieldContainer
         # object
+        dbname_to_field = cls._dbname_to_field
+        undeclared = obj._undeclared_fields
         for dbkey, dbval in doc.items():
-            fld_name = cls._dbname_to_field_name.get(dbkey, None)
-            if fld_name != None:
-                # make declared field
-                fld_obj = getattr(cls, fld_name)
-                fld_obj._store_from_doc(obj, dbval, mark_updated = False)
+            fld_obj = dbname_to_field.get(dbkey, None)
+            if fld_obj is not None:
+                # make declared field (NB _store_from_doc doesn't mark it
+                # updated by default)
+                fld_obj._store_from_doc(obj, dbval)
             else:
                 # make undeclared field
-                obj._undeclared_fields[dbkey] = dbval
+                undeclared[dbkey] = dbval
 
         return obj
 
@@ -237,9 +353,11 @@ class FieldContainer(collections.abc.MutableMapping,
     def to_doc(self):
         """Returns suited-for-DB representation of the FieldContainer.
         """
-        d = {}
-        for k in self.keys(DECLARED_ONLY):
-            d[getattr(self.__class__, k).dbname] = self.get_dbvalue(k)
+        values = self._declared_fields_values
+        d = { fld_dbname: values.get(fld_name, default) if convert is None
+                    else convert(self)
+                for fld_dbname, fld_name, default, convert
+                in self.__class__._to_doc_plan }
         d.update(self._undeclared_fields)
         return d
 
@@ -250,12 +368,21 @@ class FieldContainer(collections.abc.MutableMapping,
     ###########################################################################
 
     def __getitem__(self, fld_name):
-        if self.__class__.has_field_attr(fld_name):
+        if fld_name in self._field_attr_names:
             return getattr(self, fld_name)
         else:
             return self._undeclared_fields[fld_name]
 
 
+    def get(self, fld_name, default = None):
+        # same as Mapping.get, but without the detour through __getitem__ and
+        # catching KeyError
+        if fld_name in self._field_attr_names:
+            return getattr(self, fld_name)
+        else:
+            return self._undeclared_fields.get(fld_name, default)
+
+
     def get_dbvalue(self, fld_name, default = None):
         """Returns suitable-for-DB representation (something JSON serilizable)
         of the given field. If the field is a declared field, some conversion
@@ -264,12 +391,14 @@ class FieldContainer(collections.abc.MutableMapping,
         conversion, even if that is not json serializable. If the field does
         not exist, default is returned.
         """
-        if self.has_field_attr(fld_name):
+        fld_obj = self._declared_fields_objects.get(fld_name, None)
+        if fld_obj is not None:
+            return fld_obj._do_convert_to_doc(self)
+        elif fld_name in self._field_attr_names:
+            # FieldAlias
             return getattr(self.__class__, fld_name)._do_convert_to_doc(self)
-        elif fld_name in self._undeclared_fields:
-            return self._undeclared_fields[fld_name]
         else:
-            return default
+            return self._undeclared_fields.get(fld_name, default)
 
 
     def get_key_for_dbkey(self, dbkey):
@@ -277,11 +406,12 @@ class FieldContainer(collections.abc.MutableMapping,
         
 
     def __setitem__(self, fld_name, value):
-        if self.__class__.has_field_attr(fld_name):
+        if fld_name in self._field_attr_names:
             setattr(self, fld_name, value)
         else:
+            # (i.e. fld_name in self.dbkeys(), without making a view)
             if fld_name not in self._undeclared_fields and \
-                    fld_name in self.dbkeys():
+                    fld_name in self._dbname_to_field_name:
                 raise AlreadyExistsError("can't create an undeclared "
                         "field named {} because a declared field uses "
                         "this name for its database representation.")
@@ -302,7 +432,7 @@ class FieldContainer(collections.abc.MutableMapping,
         convert a "database field name" to a "Document field name" using
         ``get_key_for_dbkey()``.
         """
-        if self.has_field_attr(fld_name):
+        if fld_name in self._field_attr_names:
             getattr(self.__class__, fld_name).\
                     _store_from_doc(self, dbvalue, mark_updated)
         else:
@@ -310,7 +440,7 @@ class FieldContainer(collections.abc.MutableMapping,
 
 
     def __delitem__(self, fld_name):
-        if self.__class__.has_field_attr(fld_name):
+        if fld_name in self._field_attr_names:
             delattr(self, fld_name)
         else:
             del self._undeclared_fields[fld_name]
@@ -318,71 +448,97 @@ class FieldContainer(collections.abc.MutableMapping,
 
 
     def __contains__(self, fld_name):
-        if self.__class__.has_field_attr(fld_name):
+        if fld_name in self._field_attr_names:
             return True
         else:
             return fld_name in self._undeclared_fields
 
 
     class KeysView(collections.abc.KeysView):
-        def __init__(self, keygetter, which, *args, **kwargs):
-            self._keygetter = keygetter
+        def __init__(self, declared_keys, which, mapping):
+            # declared_keys: dict (or set) of the declared fields' keys. It's
+            # one of the class's dicts, so the view copies nothing. NB we set
+            # _mapping ourselves instead of calling MappingView.__init__,
+            # which does just that
+            self._declared_keys = declared_keys
             self._which = which
-            super().__init__(*args, **kwargs)
+            self._mapping = mapping
 
         def __iter__(self):
-            its = []
-            if self._which != UNDECLARED_ONLY:
-                its.append(self._keygetter())
-            if self._which != DECLARED_ONLY:
-                its.append(self._mapping._undeclared_fields.keys())
-            return itertools.chain.from_iterable(its)
+            return self._iter_keys()
+
+        def _iter_keys(self):
+            if self._which == DECLARED_ONLY:
+                return iter(self._declared_keys)
+            elif self._which == UNDECLARED_ONLY:
+                return iter(self._mapping._undeclared_fields)
+            return itertools.chain(self._declared_keys,
+                    self._mapping._undeclared_fields)
 
         def __len__(self):
             l = 0
             if self._which != UNDECLARED_ONLY:
-                l += len(self._mapping.__class__._declared_fields_objects)
+                l += len(self._declared_keys)
             if self._which != DECLARED_ONLY:
                 l += len(self._mapping._undeclared_fields)
             return l
 
         def __contains__(self, x):
-            return x in self.__iter__()
+            return (self._which != UNDECLARED_ONLY and
+                        x in self._declared_keys) or \
+                    (self._which != DECLARED_ONLY and
+                        x in self._mapping._undeclared_fields)
 
 
     def keys(self, which = ALL):
         """Returns a KeysView of field names.
         """
         return self.__class__.KeysView(
-                self.__class__._declared_fields_objects.keys, which, self)
+                self.__class__._declared_fields_objects, which, self)
 
 
     def dbkeys(self, which = ALL):
         """Returns a KeysView of database field names.
         """
         return self.__class__.KeysView(
-                self.__class__._dbname_to_field_name.keys, which, self)
+                self.__class__._dbname_to_field_name, which, self)
 
 
     def __iter__(self):
-        return self.keys().__iter__()
+        return itertools.chain(self.__class__._declared_fields_objects,
+                self._undeclared_fields)
 
 
     def __len__(self):
-        return self.len(ALL)
+        return len(self.__class__._declared_fields_objects) + \
+                len(self._undeclared_fields)
 
 
     def len(self, which = ALL):
-        return len(self.keys(which))
+        # same as len(self.keys(which)), without making the view
+        l = 0
+        if which != UNDECLARED_ONLY:
+            l += len(self.__class__._declared_fields_objects)
+        if which != DECLARED_ONLY:
+            l += len(self._undeclared_fields)
+        return l
 
 
     class ValuesView(KeysView):
-        def __init__(self, vgetter, *args, **kwargs):
+        def __init__(self, vgetter, which, mapping):
+            # iterates over the same keys as mapping.keys(which), but without
+            # making a KeysView for that
             self._vgetter = vgetter
-            super().__init__(None, *args, **kwargs)
+            self._declared_keys = mapping.__class__._declared_fields_objects
+            self._which = which
+            self._mapping = mapping
 
         def __iter__(self):
-            return (self._vgetter(k) for k in self._mapping.keys(self._which))
+            return map(self._vgetter, self._iter_keys())
+
+        def __contains__(self, x):
+            # not a key lookup as in KeysView
+            return any(v is x or v == x for v in self)
 
 
     def values(self, which = ALL):
@@ -399,8 +555,8 @@ class FieldContainer(collections.abc.MutableMapping,
 
     class ItemsView(ValuesView):
         def __iter__(self):
-            return zip(self._mapping.keys(self._which),
-                    (self._vgetter(k) for k in self._mapping.keys(self._which)))
+            vgetter = self._vgetter
+            return ((k, vgetter(k)) for k in self._iter_keys())
 
 
     def items(self, which = ALL):
@@ -445,9 +601,37 @@ class FieldContainer(collections.abc.MutableMapping,
 
         The method returns self.
         """
-        for fld_name in self._updated_fields.keys():
-            if self.__class__.has_field_attr(fld_name):
-                self.validate_field(fld_name)
+        return self.validate_fields(self._updated_fields)
+
+
+    def validate_all(self):
+        """Like validate(), but also validates the declared fields that have
+        not been updated (for example required fields that have never been
+        set). aiorethink calls this before a whole container is written to
+        the DB, e.g. when a Document is inserted.
+
+        The method returns self.
+        """
+        self.validate()
+        return self.validate_fields(
+                self.__class__._declared_fields_objects.keys() -
+                self._updated_fields)
+
+
+    def validate_fields(self, fld_names):
+        """Explicitly validate the declared fields among the given field names
+        (names of undeclared fields are ignored).
+
+        The method returns self.
+        """
+        fields_to_validate = self.__class__._fields_to_validate
+        if not fields_to_validate:
+            return self
+        values = self._declared_fields_values
+        for fld_name in fld_names:
+            fld_obj = fields_to_validate.get(fld_name, None)
+            if fld_obj is not None:
+                fld_obj.validate(values.get(fld_name, fld_obj.default))
         return self
 
 
@@ -459,10 +643,10 @@ class FieldContainer(collections.abc.MutableMapping,
 
         The method returns self.
         """
-        fld_obj = getattr(self.__class__, fld_name, None)
-        if fld_obj == None:
+        if fld_name not in self._field_attr_names:
             raise ValueError("{} is not a validatable field".
                     format(fld_name))
+        fld_obj = getattr(self.__class__, fld_name)
 
         val = self.get(fld_name, fld_obj.default)
         fld_obj.validate(val)
@@ -482,4 +666,4 @@ class FieldContainerValueType(TypedValueType):
         return pyval.to_doc()
 
     def _validate(self, val):
-        val.validate()
+        val.validate_all()
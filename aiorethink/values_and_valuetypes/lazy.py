@@ -56,7 +56,12 @@ class LazyValue:
 
     ``_val_type`` is the instance of ValueType describing what type
     the lazy-loaded value has.
+
+    Lazy values are made for every lazy field of every document loaded from
+    the DB, so they keep their state in __slots__. Subclasses should declare
+    __slots__, too.
     """
+    __slots__ = ("_val_cached", "_val_db", "_loaded")
 
     _val_type = AnyValueType()
 
@@ -66,7 +71,7 @@ class LazyValue:
             val_db = None):
         self._val_cached = val_cached
         self._val_db = val_db
-        self._loaded = (val_cached != None)
+        self._loaded = (val_cached is not None)
         if self._loaded:
             self.set(self._val_cached) # validation and conversion to DB
 
@@ -1,5 +1,3 @@
-import functools
-
 from ..errors import ValidationError
 from ..document import Document
 from ..registry import registry
@@ -20,12 +18,13 @@ class LazyDocRef(LazyValue):
     If the referenced document does not exist in the DB, attempting to access
     it through await or load() raises a NotFoundError.
     """
+    __slots__ = ("_target",)
 
     class ReferencedDocumentValueType(TypedValueType):
         _val_instance_of = Document
 
         def _validate(self, val):
-            if val != None and not val.stored_in_db:
+            if val is not None and not val.stored_in_db:
                 raise ValidationError("referenced document is not "
                         "stored in the database")
 
@@ -50,13 +49,22 @@ class LazyDocRefValueType(LazyValueType):
         """``target`` is either a Document class or the name of a Document
         class.
         """
-        self._target_resolver = functools.partial(registry.resolve, target)
+        self._target = target
+        self._target_cls = None # resolved target, see _resolve_target
         super().__init__(**kwargs)
 
+    def _resolve_target(self):
+        # the target class is looked up in the registry on first use (it
+        # might not be defined yet when we are made), and then kept
+        target_cls = self._target_cls
+        if target_cls is None:
+            target_cls = self._target_cls = registry.resolve(self._target)
+        return target_cls
+
     def create_value(self, val_cached = None, val_db = None):
         return self.__class__._val_instance_of(
                 val_db = val_db, val_cached = val_cached,
-                target = self._target_resolver())
+                target = self._resolve_target())
 
     def dbval_to_pyval(self, dbval):
         return self.create_value(val_db = dbval)
@@ -74,13 +82,20 @@ def lazy_doc_ref(doc):
         raise TypeError("{} is not a Document".format(repr(doc)))
 
 
+# { lazy-referentiable type : function making a LazyValue for objects of that
+# type (and its subclasses) }
+_lval_factories = { Document: lazy_doc_ref }
+
+
 def lval(obj):
     """Returns a LazyValue of the appropriate type (for instance LazyDocRef)
     for the given lazy-referentiable object (for instance Document)
     """
-    # TODO implement this better. I guess we need some sort of registry for
-    # whatever <-> LazyValue class pairings. If we have that, then we should be
-    # able to do this automatically.
-    if isinstance(obj, Document):
-        return lazy_doc_ref(obj)
+    # one dict lookup per class along the MRO. (No cache for the concrete
+    # type: it would keep every class we ever see alive, and a Document
+    # subclass has Document only a step or two up its MRO anyway)
+    for t in type(obj).__mro__:
+        factory = _lval_factories.get(t, None)
+        if factory is not None:
+            return factory(obj)
     raise TypeError("Can't make a lazy value for a {}".format(str(obj.__class__)))
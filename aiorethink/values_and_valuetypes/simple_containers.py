@@ -36,14 +36,14 @@ class ElementContainerValueType(TypedValueType):
 
 
     def dbval_to_pyval(self, dbval):
-        if dbval == None:
+        if dbval is None:
             return None
         return self._val_instance_of(
                 self._elem_type.dbval_to_pyval(v) for v in dbval)
 
 
     def pyval_to_dbval(self, pyval):
-        if pyval == None:
+        if pyval is None:
             return None
         return [ self._elem_type.pyval_to_dbval(v) for v in pyval ]
 
@@ -86,14 +86,14 @@ class DictValueType(TypedValueType):
 
 
     def dbval_to_pyval(self, dbval):
-        if dbval == None:
+        if dbval is None:
             return None
         return { self._key_type.dbval_to_pyval(k): self._val_type.dbval_to_pyval(v)
                 for k, v in dbval.items() }
 
 
     def pyval_to_dbval(self, pyval):
-        if pyval == None:
+        if pyval is None:
             return None
         return { self._key_type.pyval_to_dbval(k): self._val_type.pyval_to_dbval(v)
                 for k, v in pyval.items() }
@@ -134,12 +134,12 @@ class NamedTupleValueType(TypedValueType):
 
 
     def dbval_to_pyval(self, dbval):
-        if dbval == None:
+        if dbval is None:
             return None
         return self._val_instance_of(**dbval)
 
 
     def pyval_to_dbval(self, pyval):
-        if pyval == None:
+        if pyval is None:
             return None
         return pyval._asdict()
@@ -1,3 +1,4 @@
+import functools
 import re
 
 from ..errors import ValidationError
@@ -6,6 +7,10 @@ from .base_types import TypedValueType
 
 __all__ = ["IntValueType", "StringValueType"]
 
+# StringValueType remembers regex validation results for strings up to this
+# length
+_MAX_CACHED_STRING_LENGTH = 64
+
 
 class IntValueType(TypedValueType):
     _val_instance_of = int
@@ -17,14 +22,26 @@ class StringValueType(TypedValueType):
     def __init__(self, **kwargs):
         self._max_length = kwargs.pop("max_length", None)
         self._regex = kwargs.pop("regex", None)
+        self._regex_matches = None # str -> True if the regex matches
         if self._regex:
             self._regex = re.compile(self._regex)
+            # string fields often hold the same few values over and over
+            # (statuses, tags, country codes...), so we remember the results
+            # for recently seen strings. Only for short ones, though: the
+            # cache keeps the strings alive.
+            search = self._regex.search
+            cached_matches = functools.lru_cache(maxsize = 256)(
+                    lambda s: search(s) is not None)
+            self._regex_matches = lambda s: cached_matches(s) \
+                    if len(s) <= _MAX_CACHED_STRING_LENGTH \
+                    else search(s) is not None
         super().__init__(**kwargs)
 
     def _validate(self, val):
-        if val != None and self._max_length and len(val) > self._max_length:
+        if val is not None and self._max_length and len(val) > self._max_length:
             raise ValidationError("string is too long ({} chars)"
                     .format(len(val)))
 
-        if self._regex and not self._regex.search(val or ""):
+        if self._regex_matches is not None and \
+                not self._regex_matches(val or ""):
             raise ValidationError("string does not match validation regex")
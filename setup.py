@@ -24,6 +24,7 @@ setup(
 
     packages = find_packages(exclude=["docs", "tests"]),
     install_requires = ["rethinkdb", "inflection"],
+    python_requires = ">=3.7",
 
     classifiers = [
         'Development Status :: 2 - Pre-Alpha',
@@ -32,7 +33,7 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python :: 3 :: Only',
-        'Programming Language :: Python :: 3.5',
+        'Programming Language :: Python :: 3.7',
         'Topic :: Database',
         'Topic :: Internet :: WWW/HTTP :: Dynamic Content',
         ]
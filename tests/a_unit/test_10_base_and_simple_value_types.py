@@ -98,6 +98,22 @@ def test_string_re():
         vt.validate(None)
 
 
+def test_string_re_repeated_values():
+    vt = ar.StringValueType(regex = "^[a-z]+$")
+    for i in range(3):
+        assert vt.validate("abcde")
+        with pytest.raises(ar.ValidationError):
+            vt.validate("ABCDE")
+
+
+def test_string_re_long_values():
+    vt = ar.StringValueType(regex = "^[a-z]+$")
+    for i in range(2):
+        assert vt.validate("a" * 10000)
+        with pytest.raises(ar.ValidationError):
+            vt.validate("a" * 10000 + "B")
+
+
 def test_string_re_and_maxlen():
     vt = ar.StringValueType(max_length = 3, regex = "^[a-z]+$")
     assert vt.validate("abc")
@@ -80,3 +80,30 @@ async def test_value_inits(simple_lazy_type):
         assert v.get_dbval() == "WORLD"
         assert vt.validate(v) == vt
 
+
+
+def test_lval_dispatches_along_mro(aiorethink_session, monkeypatch):
+    import aiorethink.values_and_valuetypes.reference as reference
+
+    class Doc(ar.Document):
+        pass
+    class SubDoc(Doc):
+        pass
+
+    for doc_class in (Doc, SubDoc):
+        doc = doc_class.from_doc({"id": 1}, True)
+        val = ar.lval(doc)
+        assert isinstance(val, ar.LazyDocRef)
+        assert val._target is doc_class
+        assert val.get() is doc
+
+    class Base:
+        pass
+    class Derived(Base):
+        pass
+    monkeypatch.setitem(reference._lval_factories, Base, lambda obj: "made")
+    assert ar.lval(Derived()) == "made"
+
+    for obj in (1, "doc", ar.FieldContainer()):
+        with pytest.raises(TypeError):
+            ar.lval(obj)
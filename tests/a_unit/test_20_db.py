@@ -52,6 +52,91 @@ async def test_double_close4(db_conn):
     await cn.close()
 
 
+@pytest.mark.asyncio
+async def test_db_conn_reopens_closed_conn(db_conn):
+    cn = await db_conn
+    await cn.close()
+
+    cn2 = await db_conn
+    assert cn2 != cn
+    assert cn2.is_open()
+    dbs = await r.db_list().run(cn2)
+    assert dbs != None
+
+
+@pytest.mark.asyncio
+async def test_pooled_conns(db_conn):
+    cn = await db_conn
+
+    async with db_conn.connect() as cn1:
+        async with db_conn.connect() as cn2:
+            assert cn1 != cn2
+            assert cn1 != cn and cn2 != cn
+            dbs = await r.db_list().run(cn1)
+            assert dbs != None
+
+    # released connections are reused
+    async with db_conn.connect() as cn3:
+        assert cn3 in (cn1, cn2)
+
+    await db_conn.close()
+    assert not cn1.is_open() and not cn2.is_open()
+
+
+@pytest.mark.asyncio
+async def test_pooled_conn_reopens_closed_conn(db_conn):
+    async with db_conn.connect() as cn1:
+        pass
+    await cn1.close()
+
+    async with db_conn.connect() as cn2:
+        assert cn2.is_open()
+        assert cn2 != cn1
+
+
+@pytest.mark.asyncio
+async def test_session(db_conn):
+    cn = await db_conn
+
+    async with db_conn.session() as scn:
+        assert scn != cn
+        assert await db_conn == scn
+        # tasks started within the session use its connection, too
+        assert await asyncio.ensure_future(db_conn.get()) == scn
+
+    assert await db_conn == cn
+
+
+def test_pool_goes_away_with_its_loop():
+    import gc
+    from aiorethink.db import _ConnectionManager
+
+    class FakeConn:
+        # like the driver's connections, this refers to its event loop
+        def __init__(self, loop):
+            self._io_loop = loop
+
+    manager = _ConnectionManager()
+    manager.configure_db_connection(pool_size = 1, connection_ttl = 10,
+            db = "testing")
+
+    old_loop = asyncio.get_event_loop()
+    loop = asyncio.new_event_loop()
+    try:
+        asyncio.set_event_loop(loop)
+        pool = manager._get_pool()
+        assert manager._get_pool() is pool
+        pool._default = FakeConn(loop)
+    finally:
+        asyncio.set_event_loop(old_loop)
+    assert len(manager._pools) == 1
+
+    loop.close()
+    del loop, pool
+    gc.collect()
+    assert len(manager._pools) == 0
+
+
 @pytest.mark.asyncio
 @pytest.mark.timeout(10)
 async def test_multithreading(db_conn, capsys):
@@ -223,6 +308,41 @@ async def test_cursor_async_map(db_conn, aiorethink_db_session):
     assert vs == [1,2,3]
 
 
+@pytest.mark.asyncio
+async def test_cursor_async_map_batches(db_conn, aiorethink_db_session):
+    from aiorethink.db import CursorAsyncMap
+    cn = await db_conn
+
+    await r.table_create("test").run(cn)
+    await r.table("test").insert([{"v": v} for v in range(10)]).run(cn)
+
+    cursor = await r.table("test").run(cn, max_batch_rows = 3)
+    vs = []
+    async for batch in CursorAsyncMap(cursor, lambda d: d["v"]).batches():
+        assert type(batch) == list and len(batch) > 0
+        vs.extend(batch)
+    vs.sort()
+    assert vs == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_cursor_async_iterator_close(db_conn, aiorethink_db_session):
+    from aiorethink.db import CursorAsyncIterator
+    cn = await db_conn
+
+    await r.table_create("test").run(cn)
+    await r.table("test").insert([{"v": v} for v in range(10)]).run(cn)
+
+    cursor = await r.table("test").run(cn, max_batch_rows = 2)
+    it = CursorAsyncIterator(cursor)
+    async for item in it:
+        break
+    await it.close()
+
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+
 @pytest.mark.asyncio
 async def test_aiter_changes(event_loop, db_conn, aiorethink_db_session):
     cn = await db_conn
@@ -0,0 +1,275 @@
+import asyncio
+import collections
+
+import pytest
+import rethinkdb as r
+
+from aiorethink.db import CursorAsyncIterator, CursorAsyncMap, \
+        ChangesAsyncMap, ChangesAsyncMapValuesOnly, _without_status_messages
+
+
+class FakeCursor:
+    """Stands in for the driver's asyncio cursor: received items sit in the
+    `items` deque, further batches arrive some time after they're requested,
+    and `error` is set once the cursor is done.
+    """
+    def __init__(self, data, batch_size = 3, error = None):
+        self.pending = list(data)
+        self.batch_size = batch_size
+        self.final_error = error or r.ReqlCursorEmpty()
+        self.items = collections.deque()
+        self.error = None
+        self.closed = False
+        self.nexts_waiting = 0
+        self._fetch = None
+
+    async def _fetch_batch(self):
+        await asyncio.sleep(0.001)
+        batch = self.pending[:self.batch_size]
+        self.pending = self.pending[self.batch_size:]
+        self.items.extend(batch)
+        if not self.pending and self.error is None:
+            self.error = self.final_error
+
+    async def next(self, wait = True):
+        while not self.items:
+            if self.error is not None:
+                raise self.error
+            if not wait:
+                raise r.ReqlTimeoutError()
+            if self._fetch is None or self._fetch.done():
+                self._fetch = asyncio.ensure_future(self._fetch_batch())
+            self.nexts_waiting += 1
+            try:
+                await asyncio.shield(self._fetch)
+            finally:
+                self.nexts_waiting -= 1
+        return self.items.popleft()
+
+    async def close(self):
+        self.closed = True
+        if self.error is None:
+            self.error = r.ReqlCursorEmpty()
+
+
+def pending_cursor_tasks():
+    return [ t for t in asyncio.all_tasks()
+            if not t.done() and "FakeCursor.next" in repr(t.get_coro()) ]
+
+
+
+###############################################################################
+# CursorAsyncIterator
+###############################################################################
+
+@pytest.mark.asyncio
+async def test_iterate_all():
+    it = CursorAsyncIterator(FakeCursor(range(10)))
+    res = [ item async for item in it ]
+    assert res == list(range(10))
+    assert it._pending is None
+    assert pending_cursor_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_no_prefetch_while_cursor_has_items():
+    cursor = FakeCursor(range(10))
+    it = CursorAsyncIterator(cursor)
+    assert await it.__anext__() == 0
+    assert len(cursor.items) == 2
+    assert it._pending is None
+    assert await it.__anext__() == 1
+    assert it._pending is None
+
+    assert await it.__anext__() == 2 # takes the last item of the batch
+    assert it._pending is not None
+    await it.close()
+
+
+@pytest.mark.asyncio
+async def test_break_early_leaves_no_task_running():
+    cursor = FakeCursor(range(10))
+    it = CursorAsyncIterator(cursor)
+    async for item in it:
+        if item == 2:
+            break
+    assert it._pending is not None # prefetch of the next batch is underway
+
+    await it.aclose()
+    await asyncio.sleep(0)
+    assert it._pending is None
+    assert cursor.closed
+    assert pending_cursor_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_abandoned_iterator_cancels_prefetch():
+    it = CursorAsyncIterator(FakeCursor(range(10)))
+    async for item in it:
+        if item == 2:
+            break
+    pending = it._pending
+    assert pending is not None
+
+    del it
+    await asyncio.sleep(0)
+    assert pending.cancelled()
+    assert pending_cursor_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_cursor_map():
+    it = CursorAsyncMap(FakeCursor(range(5)), lambda i: i * 2)
+    res = [ item async for item in it ]
+    assert res == [0, 2, 4, 6, 8]
+
+
+
+@pytest.mark.asyncio
+async def test_batches():
+    it = CursorAsyncMap(FakeCursor(range(8), batch_size = 3), lambda i: -i)
+    res = [ batch async for batch in it.batches() ]
+    assert res == [[0, -1, -2], [-3, -4, -5], [-6, -7]]
+    assert pending_cursor_tasks() == []
+
+
+@pytest.mark.asyncio
+async def test_batches_after_items():
+    it = CursorAsyncIterator(FakeCursor(range(8), batch_size = 3))
+    assert await it.__anext__() == 0
+    res = [ batch async for batch in it.batches() ]
+    assert res == [[1, 2], [3, 4, 5], [6, 7]]
+
+
+@pytest.mark.asyncio
+async def test_batches_error():
+    error = r.ReqlRuntimeError("cursor broke")
+    it = CursorAsyncIterator(FakeCursor(range(5), error = error))
+    res = []
+    with pytest.raises(r.ReqlRuntimeError):
+        async for batch in it.batches():
+            res.append(batch)
+    assert res == [[0, 1, 2], [3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_as_list():
+    for size_hint in (None, 0, 3, 7, 100):
+        it = CursorAsyncMap(FakeCursor(range(7)), str)
+        assert await it.as_list(size_hint) == list(map(str, range(7)))
+
+    assert await CursorAsyncIterator(FakeCursor([])).as_list(5) == []
+
+
+###############################################################################
+# ChangesAsyncMap
+###############################################################################
+
+def changes(n):
+    return [ {"old_val": None, "new_val": i} for i in range(n) ]
+
+
+@pytest.mark.asyncio
+async def test_changes_map():
+    messages = changes(3) + [{"state": "ready"}] + changes(5)[3:]
+    it = ChangesAsyncMap(FakeCursor(messages), lambda v: v * 2)
+    res = [ item async for item in it ]
+    assert [ obj for obj, msg in res ] == [0, 2, 4, 6, 8]
+    assert [ msg["new_val"] for obj, msg in res ] == [0, 1, 2, 3, 4]
+
+    it = ChangesAsyncMapValuesOnly(FakeCursor(messages), lambda v: v * 2)
+    assert [ obj async for obj in it ] == [0, 2, 4, 6, 8]
+
+
+def test_status_messages_filtered_only_when_requested():
+    q = r.table("test").changes()
+    assert _without_status_messages(q) == (q, False)
+
+    q = r.table("test").changes(include_states = False)
+    assert _without_status_messages(q) == (q, False)
+
+    q = r.table("test").changes(include_states = True)
+    filtered, new_vals_only = _without_status_messages(q)
+    assert new_vals_only
+    assert filtered is not q
+    assert "filter" in str(filtered)
+
+
+@pytest.mark.asyncio
+async def test_changes_map_new_vals_only():
+    it = ChangesAsyncMapValuesOnly(FakeCursor(changes(4)), lambda v: v,
+            new_vals_only = True)
+    assert [ obj async for obj in it ] == [0, 1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_changes_pump_fills_buffer():
+    cursor = FakeCursor(changes(10), batch_size = 5)
+    it = ChangesAsyncMapValuesOnly(cursor, lambda v: v)
+    assert await it.__anext__() == 0
+    await asyncio.sleep(0.01)
+    # the pump has read everything without being asked for it
+    assert list(it._state.buf) == changes(10)[1:]
+    assert it._state.exhausted
+    assert [ obj async for obj in it ] == list(range(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_changes_buffer_is_capped():
+    cursor = FakeCursor(changes(20), batch_size = 5)
+    it = ChangesAsyncMapValuesOnly(cursor, lambda v: v, max_prefetch = 3)
+    assert await it.__anext__() == 0
+    await asyncio.sleep(0.01)
+    assert len(it._state.buf) == 3
+    assert len(cursor.items) > 0 # rest stays with the cursor
+
+    res = []
+    async for obj in it:
+        assert len(it._state.buf) <= 3
+        res.append(obj)
+    assert res == list(range(1, 20))
+
+
+@pytest.mark.asyncio
+async def test_changes_error_is_raised_once():
+    error = r.ReqlRuntimeError("changefeed went away")
+    it = ChangesAsyncMapValuesOnly(FakeCursor(changes(4), error = error),
+            lambda v: v)
+    res = []
+    with pytest.raises(r.ReqlRuntimeError):
+        async for obj in it:
+            res.append(obj)
+    assert res == [0, 1, 2, 3]
+    assert it._state.error is None
+
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_changes_close_stops_pump():
+    cursor = FakeCursor(changes(20))
+    it = ChangesAsyncMap(cursor, lambda v: v)
+    await it.__anext__()
+    task = it._pump_task
+
+    await it.aclose()
+    await asyncio.sleep(0)
+    assert task.done()
+    assert cursor.closed
+    with pytest.raises(StopAsyncIteration):
+        await it.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_changes_abandoned_iterator_stops_pump():
+    cursor = FakeCursor(changes(20), batch_size = 1)
+    it = ChangesAsyncMap(cursor, lambda v: v)
+    await it.__anext__()
+    task = it._pump_task
+
+    del it
+    await asyncio.sleep(0.01)
+    assert task.cancelled()
+    assert cursor.closed
+    assert pending_cursor_tasks() == []
@@ -67,6 +67,11 @@ def test_just_declared_fields(FCWithFields):
     assert len(fc) == 2
 
 
+def test_str_declared_fields_first(FCWithFields):
+    fc = FCWithFields(f3 = 3, f1 = 1)
+    assert str(fc) == str({"f1": 1, "f3": 3})
+
+
 def test_mixed_fields(FCWithFields):
     fc = FCWithFields()
     fc["f3"] = 3
@@ -79,6 +84,21 @@ def test_invalid_field_name(aiorethink_session):
             items = ar.Field()
 
 
+def test_field_added_with_setattr(aiorethink_session):
+    # setattr() on a class doesn't call the field's __set_name__
+    class Base(ar.FieldContainer):
+        def __init_subclass__(cls, **kwargs):
+            super().__init_subclass__(**kwargs)
+            cls.added = ar.Field()
+    class MyFC(Base):
+        f1 = ar.Field()
+
+    assert MyFC.added.name == "added"
+    fc = MyFC(added = 1)
+    assert fc.added == 1
+    assert fc.to_doc() == {"f1": None, "added": 1}
+
+
 ###############################################################################
 # dict-like interface
 ###############################################################################
@@ -339,6 +359,38 @@ def test_to_doc(fc_with_swapcase_field):
         assert d.get_dbvalue(d.get_key_for_dbkey(k)) == v
 
 
+def test_compiled_to_doc_matches_generic(FCWithSpecialDBReprField):
+    class FC(FCWithSpecialDBReprField):
+        f2 = ar.Field(ar.SetValueType(), default = {1}) # overrides f2
+        f3 = ar.Field(default = "x")
+        f3_alias = ar.FieldAlias(f3)
+    assert FC.to_doc is not ar.FieldContainer.to_doc
+
+    fcs = [ FC(), FC(f1 = 1, f2 = {2, 3}, f3 = None, f_swapcase = "aB"),
+            FC(f1 = 1, undeclared = [1]),
+            FCWithSpecialDBReprField(f2 = "Bla", f_swapcase = "Hello") ]
+    fcs[1]["undeclared"] = "yes"
+    fcs[2].f3_alias = "y"
+    for fc in fcs:
+        assert fc.to_doc() == ar.FieldContainer.to_doc(fc)
+
+    doc = FC().to_doc()
+    assert doc["f2"] == [1]
+    assert doc["f3"] == "x"
+    assert doc["field1"] == None
+
+
+def test_custom_to_doc_is_kept(FCWithFields):
+    class CustomFC(FCWithFields):
+        def to_doc(self):
+            return "custom"
+    class CustomFCChild(CustomFC):
+        f3 = ar.Field()
+
+    assert CustomFC().to_doc() == "custom"
+    assert CustomFCChild().to_doc() == "custom"
+
+
 ###############################################################################
 # validation
 ###############################################################################
@@ -361,6 +413,19 @@ def test_validate_simple_fc(fc_mixed):
     fc_mixed.validate()
 
 
+def test_validate_all():
+    class FC(ar.FieldContainer):
+        f1 = ar.Field()
+        f2 = ar.Field(required = True)
+    fc = FC(f1 = 1)
+
+    fc.validate() # f2 has not been updated
+    with pytest.raises(ar.ValidationError):
+        fc.validate_all()
+    fc.f2 = 2
+    assert fc.validate_all() == fc
+
+
 @pytest.fixture
 def FCEvenValidator(FCWithFields):
     class FCIntValidator(FCWithFields):
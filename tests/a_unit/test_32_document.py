@@ -130,6 +130,12 @@ def test_custom_table_name(EmptyDocCustomTableName):
     assert EmptyDocCustomTableName._tablename == "CustomTableName"
 
 
+def test_tablename_on_instances(EmptyDocCustomTableName):
+    d = EmptyDocCustomTableName()
+    assert d._tablename == "CustomTableName"
+    assert d._cq_term is EmptyDocCustomTableName.cq()
+
+
 @pytest.mark.asyncio
 async def test_custom_table_does_not_exist(EmptyDocCustomTableName, aiorethink_db_session):
     assert not await EmptyDocCustomTableName.table_exists()
@@ -230,6 +236,108 @@ async def test_create_doc(EmptyDoc, aiorethink_db_session, db_conn):
     assert num_docs == 1
 
 
+@pytest.mark.asyncio
+async def test_bulk_create(EmptyDoc, aiorethink_db_session, db_conn):
+    await EmptyDoc._create_table()
+    cn = await db_conn
+    docs = [ EmptyDoc(f1 = i) for i in range(5) ]
+    docs[0].id = "custom"
+
+    await EmptyDoc.bulk_create(docs, batch_size = 2)
+
+    assert all(d.stored_in_db for d in docs)
+    assert docs[0].id == "custom"
+    assert len(set(d.id for d in docs)) == 5
+    for d in docs:
+        assert (await EmptyDoc.load(d.id))["f1"] == d["f1"]
+
+    with pytest.raises(ar.AlreadyExistsError):
+        await EmptyDoc.bulk_create(docs[:1])
+
+
+def test_compiled_insert_dict_matches_generic(aiorethink_session):
+    class Doc(ar.Document):
+        plain = ar.Field(default = 1)
+        renamed = ar.Field(name = "in_db", default = "r")
+        tags = ar.Field(ar.SetValueType(), default = {1})
+        alias = ar.FieldAlias(plain)
+    class SubDoc(Doc):
+        plain = ar.Field(ar.IntValueType(), default = 2) # overrides plain
+        more = ar.Field()
+    class CustomPkeyDoc(ar.Document):
+        key = ar.Field(ar.StringValueType(), primary_key = True)
+        f1 = ar.Field()
+
+    docs = [ Doc(), Doc(id = "x", plain = None, renamed = 3, tags = {2}),
+            Doc(undeclared = 1), SubDoc(), SubDoc(id = 1, more = [1], x = 2),
+            CustomPkeyDoc(), CustomPkeyDoc(key = "k", f1 = 1) ]
+    docs[0].alias = 5
+    for doc in docs:
+        assert doc._make_insert_dict() == ar.Document._make_insert_dict(doc)
+
+    assert Doc()._make_insert_dict() == \
+            {"plain": 1, "in_db": "r", "tags": [1]}
+    assert SubDoc(id = 1)._make_insert_dict()["id"] == 1
+    assert "id" not in SubDoc()._make_insert_dict()
+
+
+def test_custom_insert_dict_is_kept(aiorethink_session):
+    class CustomDoc(ar.Document):
+        f1 = ar.Field()
+        def _make_insert_dict(self):
+            return {"custom": True}
+    class CustomDocChild(CustomDoc):
+        f2 = ar.Field()
+
+    assert CustomDoc()._make_insert_dict() == {"custom": True}
+    assert CustomDocChild()._make_insert_dict() == {"custom": True}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_marks_only_inserted(EmptyDoc, aiorethink_db_session,
+        db_conn):
+    await EmptyDoc._create_table()
+    await EmptyDoc.create(id = "taken", f1 = "old")
+
+    # NB the tuples come back from the DB as lists
+    docs = [ EmptyDoc(id = "taken", f1 = "new"),
+            EmptyDoc(id = "free", f1 = (1, 2)), EmptyDoc(f1 = (3,)),
+            EmptyDoc(f1 = 2) ]
+    res = await EmptyDoc.bulk_create(docs)
+
+    assert res[0]["errors"] == 1
+    assert [ d.stored_in_db for d in docs ] == [False, True, True, True]
+    assert docs[2].id != None and docs[3].id != None
+    assert docs[2].id != docs[3].id
+    assert (await EmptyDoc.load("taken"))["f1"] == "old"
+    assert (await EmptyDoc.load(docs[3].id))["f1"] == 2
+
+
+def test_bulk_create_mark_inserted(EmptyDoc):
+    docs = [ EmptyDoc(id = "taken", f1 = (1,)), EmptyDoc(id = "free"),
+            EmptyDoc(f1 = "no key"), EmptyDoc(f1 = "failed"),
+            EmptyDoc(f1 = "no key either") ]
+    changes = [
+        {"error": "Duplicate primary key `id`", "new_val": {"id": "taken"},
+            "old_val": {"id": "taken"}},
+        {"new_val": {"id": "free"}, "old_val": None},
+        {"new_val": {"id": "gen1", "f1": "no key"}, "old_val": None},
+        {"error": "something went wrong", "new_val": None, "old_val": None},
+        {"new_val": {"id": "gen2", "f1": "no key either"}, "old_val": None},
+    ]
+    EmptyDoc._mark_inserted(docs, changes)
+
+    assert [ d.stored_in_db for d in docs ] == [False, True, True, False, True]
+    assert [ d.id for d in docs ] == ["taken", "free", "gen1", None, "gen2"]
+    assert not docs[2]._updated_fields
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_nothing(EmptyDoc):
+    # doesn't even need a DB connection
+    assert await EmptyDoc.bulk_create([]) == []
+
+
 @pytest.fixture
 def MyTestDocs(aiorethink_db_session, event_loop, db_conn):
     class Doc(ar.Document):
@@ -338,6 +446,23 @@ async def test_load_doc(MyTestDocs, db_conn):
             l = await Doc.load("hello")
 
 
+@pytest.mark.asyncio
+async def test_load_many(MyTestDocs, db_conn):
+    for Doc in MyTestDocs:
+        ds = [ Doc(f2 = i) for i in range(3) ]
+        for d in ds:
+            await d.save()
+        pkeys = [ d.pkey for d in ds ]
+
+        l = await Doc.load_many(pkeys + [pkeys[0], "hello"])
+        assert set(l.keys()) == set(pkeys)
+        for d in ds:
+            assert l[d.pkey].stored_in_db
+            assert l[d.pkey].f2 == d.f2
+
+        assert await Doc.load_many([]) == {}
+
+
 @pytest.mark.asyncio
 async def test_from_cursor(EmptyDoc, db_conn, aiorethink_db_session):
     cn = await db_conn
@@ -381,6 +506,91 @@ async def test_from_query(EmptyDoc, db_conn, aiorethink_db_session):
         await EmptyDoc.from_query(r)
 
 
+###############################################################################
+# from_doc
+###############################################################################
+
+@pytest.fixture
+def ConvDoc(aiorethink_session):
+    class ConvDoc(ar.Document):
+        plain = ar.Field()
+        renamed = ar.Field(name = "in_db")
+        tags = ar.Field(ar.SetValueType())
+        with_default = ar.Field(default = 5)
+        alias = ar.FieldAlias(plain)
+    return ConvDoc
+
+
+from_doc_test_docs = [
+    {},
+    {"id": 1},
+    {"id": 1, "plain": "a", "in_db": 2, "tags": [1, 2], "with_default": None},
+    {"id": 1, "plain": "a", "renamed": "not the field", "x": [1]},
+    {"tags": [3], "x": 1, "y": 2},
+]
+
+
+def generic_from_doc(cls, doc, stored_in_db):
+    obj = ar.FieldContainer.from_doc.__func__(cls, doc)
+    obj._stored_in_db = stored_in_db
+    return obj
+
+
+def assert_same_state(obj1, obj2):
+    assert type(obj1) is type(obj2)
+    for attr in ("_declared_fields_values", "_undeclared_fields",
+            "_updated_fields", "_stored_in_db"):
+        assert getattr(obj1, attr) == getattr(obj2, attr)
+
+
+def test_from_doc_matches_generic(ConvDoc):
+    for doc in from_doc_test_docs:
+        for stored_in_db in (True, False):
+            assert_same_state(ConvDoc.from_doc(doc, stored_in_db),
+                    generic_from_doc(ConvDoc, doc, stored_in_db))
+
+    d = ConvDoc.from_doc(from_doc_test_docs[2], True)
+    assert d.plain == d.alias == "a"
+    assert d.renamed == 2
+    assert d.tags == {1, 2}
+    assert d.with_default == None
+    assert ConvDoc.from_doc({}, True).with_default == 5
+
+
+def test_from_doc_custom_init(aiorethink_session):
+    class InitDoc(ar.Document):
+        f1 = ar.Field()
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.initialized = True
+
+    for doc in from_doc_test_docs:
+        d = InitDoc.from_doc(doc, True)
+        assert d.initialized
+        assert_same_state(d, generic_from_doc(InitDoc, doc, True))
+
+
+def test_from_doc_passes_kwargs_on(aiorethink_session):
+    class KwargsContainer(ar.FieldContainer):
+        @classmethod
+        def from_doc(cls, doc, **kwargs):
+            obj = super().from_doc(doc)
+            obj.from_doc_kwargs = kwargs
+            return obj
+    class KwargsDoc(ar.Document, KwargsContainer):
+        f1 = ar.Field()
+
+    d = KwargsDoc.from_doc({"f1": 1}, True, foo = "bar")
+    assert d.from_doc_kwargs == {"foo": "bar"}
+    assert d.f1 == 1
+    assert d.stored_in_db
+
+
+def test_from_doc_needs_subclass(aiorethink_session):
+    with pytest.raises(TypeError):
+        ar.Document.from_doc({}, True)
+
+
 ###############################################################################
 # Subclassing
 ###############################################################################
@@ -456,6 +666,41 @@ async def test_table_changefeed(EmptyDoc, db_conn, aiorethink_db_session, event_
     assert table_tracker.result() == [0,1,2]
 
 
+@pytest.mark.asyncio
+async def test_table_changefeed_reuse_instance(EmptyDoc, db_conn,
+        aiorethink_db_session, event_loop):
+    cn = await db_conn
+    await EmptyDoc._create_table()
+
+    async def track_table_changes(num_changes):
+        i = 0
+        vals = []
+        docs = set()
+        async for doc in await EmptyDoc.aiter_table_changes(
+                include_message = False, reuse_instance = True):
+            i += 1
+            assert isinstance(doc, EmptyDoc)
+            assert doc.stored_in_db
+            docs.add(id(doc))
+            vals.append(doc["f1"])
+            if i >= num_changes:
+                break
+        assert len(docs) == 1
+        return vals
+
+    table_tracker = event_loop.create_task(track_table_changes(3))
+    await asyncio.sleep(0.5)
+    for i in range(3):
+        d = EmptyDoc(f1 = i)
+        await d.save()
+        await asyncio.sleep(0.2)
+    done, pending = await asyncio.wait([table_tracker], timeout=1.0)
+
+    assert table_tracker in done
+    assert table_tracker.exception() == None
+    assert table_tracker.result() == [0,1,2]
+
+
 @pytest.mark.asyncio
 async def test_doc_changefeed(EmptyDoc, db_conn, aiorethink_db_session, event_loop):
     cn = await db_conn
@@ -491,3 +736,49 @@ async def test_doc_changefeed(EmptyDoc, db_conn, aiorethink_db_session, event_lo
         doc_tracker.print_stack()
     assert doc_tracker.exception() == None
     assert doc_tracker.result() == [0,1,2]
+
+
+class MessageCursor:
+    """Plays back changefeed messages like a (very fast) changefeed cursor.
+    """
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def next(self):
+        if not self.messages:
+            raise r.ReqlCursorEmpty()
+        return self.messages.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_doc_changefeed_diffs_against_doc(aiorethink_session,
+        monkeypatch):
+    import aiorethink.document
+    class Doc(ar.Document):
+        f1 = ar.Field()
+    base = {"id": 1, "f1": 1, "f2": "a"}
+    messages = [
+        {"new_val": base},
+        {"new_val": dict(base, f1 = 2)},
+        {"state": "ready"},
+        {"new_val": dict(base, f1 = 2)}, # the doc was changed locally meanwhile
+        {"new_val": dict(base, f1 = 2, tags = [1, 2])},
+        {"new_val": None, "old_val": base},
+    ]
+    async def run_query(query, conn):
+        return MessageCursor(messages)
+    monkeypatch.setattr(aiorethink.document, "_run_query", run_query)
+
+    d = Doc.from_doc({"id": 1}, True)
+    changes = []
+    async for doc, changed_fields, msg in await d.aiter_changes():
+        assert doc is d
+        changes.append(changed_fields)
+        if len(changes) == 2:
+            # not even marked as updated
+            d.set_dbvalue("f1", "local", mark_updated = False)
+
+    assert changes == [["f1", "f2"], ["f1"], ["f1"], ["tags"], None]
+    assert d["f1"] == 2
+    assert d["tags"] == [1, 2]
+    assert not d.stored_in_db